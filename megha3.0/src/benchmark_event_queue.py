@@ -0,0 +1,108 @@
+"""
+Program to compare the event queue backends on the input traces.
+
+For every trace given on the command line, this program replays the event \
+pattern the simulator produces for it through each backend in \
+`event_core.EVENT_QUEUE_BACKENDS`: the job arrivals from the trace, a \
+request, launch, end and response event per task (spaced by \
+`NETWORK_DELAY` and the task duration) and the periodic LM heartbeat. \
+Scheduling decisions are left out so that only the cost of the queue is \
+measured. The order in which events are popped is checked to be the same \
+for every backend.
+
+Usage:
+    python3 src/benchmark_event_queue.py <trace> [<trace> ...]
+
+The `src/megha_sim` folder has to be on the `PYTHONPATH`, as for `runner.py`.
+"""
+
+import os
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from event_core import EVENT_QUEUE_BACKENDS
+from simulator_utils.values import (LM_HEARTBEAT_INTERVAL, NETWORK_DELAY,
+                                    EventPriority)
+
+
+class ReplayEvent(object):
+    """Stand-in for the simulator's events, carrying only what is queued."""
+
+    __slots__ = ("PRIORITY", "duration")
+
+    def __init__(self, priority: int, duration: int = 0):
+        self.PRIORITY = priority
+        self.duration = duration
+
+
+def read_trace(trace_file: str) -> List[Tuple[float, List[int]]]:
+    """Return the arrival time and the task durations of every job."""
+    jobs = []
+    with open(trace_file, "r") as jobs_file:
+        for line in jobs_file:
+            job_args = line.split()
+            jobs.append((float(job_args[0]),
+                         [int(float(duration)) for duration in job_args[3:]]))
+    return jobs
+
+
+def replay(backend: str, jobs: List[Tuple[float, List[int]]]
+           ) -> Tuple[int, float, int]:
+    """
+    Replay the event pattern of the jobs through one event queue backend.
+
+    Returns:
+        Tuple[int, float, int]: The number of events popped, the time taken \
+        in seconds and a checksum of the order the events were popped in.
+    """
+    event_queue = EVENT_QUEUE_BACKENDS[backend]()
+    next_job = 0
+    popped = 0
+    checksum = 0
+    start = time.perf_counter()
+    event_queue.push(jobs[0][0] - 0.05,
+                     ReplayEvent(EventPriority.LM_REQUEST_UPDATE))
+    event_queue.push(jobs[0][0], ReplayEvent(EventPriority.JOB_ARRIVAL))
+    while event_queue:
+        current_time, event = event_queue.pop()
+        popped += 1
+        checksum = (checksum * 31 + event.PRIORITY) & 0xFFFFFFFF
+        priority = event.PRIORITY
+        if priority == EventPriority.JOB_ARRIVAL:
+            event_queue.push_all(
+                (current_time + NETWORK_DELAY,
+                 ReplayEvent(EventPriority.VERIFY_REQUESTS, duration))
+                for duration in jobs[next_job][1])
+            next_job += 1
+            if next_job < len(jobs):
+                event_queue.push(jobs[next_job][0], event)
+        elif priority == EventPriority.VERIFY_REQUESTS:
+            event.PRIORITY = EventPriority.LAUNCH_ON_NODE
+            event_queue.push(current_time + NETWORK_DELAY, event)
+        elif priority == EventPriority.LAUNCH_ON_NODE:
+            event.PRIORITY = EventPriority.TASK_END
+            event_queue.push(current_time + event.duration, event)
+        elif priority == EventPriority.TASK_END:
+            event.PRIORITY = EventPriority.TASK_RESPONSE
+            event_queue.push(current_time + NETWORK_DELAY, event)
+        elif priority == EventPriority.LM_REQUEST_UPDATE:
+            if event_queue:
+                event_queue.push(current_time + LM_HEARTBEAT_INTERVAL, event)
+    return popped, time.perf_counter() - start, checksum
+
+
+if __name__ == "__main__":
+    print(f"{'trace':<20} {'backend':<10} {'events':>10} {'time (s)':>10} "
+          f"{'events/s':>12}")
+    for trace_file in sys.argv[1:]:
+        jobs = read_trace(trace_file)
+        checksums: Dict[str, int] = {}
+        for backend in EVENT_QUEUE_BACKENDS:
+            popped, elapsed, checksums[backend] = replay(backend, jobs)
+            print(f"{os.path.basename(trace_file):<20} {backend:<10} {popped:>10} "
+                  f"{elapsed:>10.3f} {popped / elapsed:>12.0f}")
+        if len(set(checksums.values())) != 1:
+            print(f"{trace_file}: backends popped the events in a different "
+                  "order")
+            sys.exit(1)
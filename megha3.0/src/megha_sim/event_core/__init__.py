@@ -0,0 +1,11 @@
+from typing import Dict
+from typing_extensions import Final
+
+from .heap_queue import EventQueue
+from .calendar_queue import CalendarQueue
+
+# Event queue backends selectable by name in `Simulation`
+EVENT_QUEUE_BACKENDS: Final[Dict[str, type]] = {
+    "heap": EventQueue,
+    "calendar": CalendarQueue,
+}
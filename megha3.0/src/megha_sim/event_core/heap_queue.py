@@ -0,0 +1,111 @@
+"""
+This file contains the implementation of the event queue of the simulator.
+
+The simulator runs on a single thread, so the pending events are kept in a \
+plain binary heap instead of a `queue.PriorityQueue`, which acquires a lock \
+and notifies a condition variable on every `put` and `get`.
+"""
+
+from __future__ import annotations
+from heapq import heapify, heappop, heappush
+from itertools import count
+from typing import Iterable, List, Tuple, TYPE_CHECKING
+
+# Imports used only for type checking go here to avoid circular imports
+if TYPE_CHECKING:
+    from events import Event
+
+# (time, priority class of the event type, insertion sequence, event)
+EventEntry = Tuple[float, int, int, "Event"]
+
+
+class EventQueue(object):
+    """
+    Binary heap holding the pending events of the simulation.
+
+    Each entry is stored as a `(time, priority, sequence, event)` tuple, \
+    where `priority` is the `PRIORITY` class of the event type and \
+    `sequence` comes from a monotonic counter. Since no two entries share a \
+    sequence number, the heap orders entries with plain float and int \
+    comparisons and never calls into a Python-level `Event.__lt__`. Events \
+    with the same timestamp are returned by priority class and then in the \
+    order they were pushed, so a run is reproducible for a given trace and \
+    configuration.
+    """
+
+    def __init__(self):
+        """Initialise an empty event queue."""
+        self._heap: List[EventEntry] = []
+        self._sequence = count()
+
+    def push(self, time: float, event: Event) -> None:
+        """
+        Add an event to the queue.
+
+        Args:
+            time (float): The simulation time at which the event is to run.
+            event (Event): The event to run.
+        """
+        heappush(self._heap,
+                 (time, event.PRIORITY, next(self._sequence), event))
+
+    def push_all(self, timed_events: Iterable[Tuple[float, Event]]) -> None:
+        """
+        Add several `(time, event)` pairs to the queue.
+
+        When more events are added than are already queued, the heap is \
+        rebuilt in one pass instead of sifting each entry in.
+
+        Args:
+            timed_events (Iterable[Tuple[float, Event]]): The events to add \
+            along with the simulation time at which each is to run.
+        """
+        sequence = self._sequence
+        entries = [(time, event.PRIORITY, next(sequence), event)
+                   for time, event in timed_events]
+        heap = self._heap
+        if len(entries) > len(heap):
+            heap.extend(entries)
+            heapify(heap)
+        else:
+            for entry in entries:
+                heappush(heap, entry)
+
+    def pop(self) -> Tuple[float, Event]:
+        """
+        Remove and return the earliest event in the queue.
+
+        Returns:
+            Tuple[float, Event]: The time of the event and the event.
+        """
+        time, _, _, event = heappop(self._heap)
+        return time, event
+
+    def pop_batch(self) -> Tuple[float, List[Event]]:
+        """
+        Remove and return every event that shares the earliest timestamp.
+
+        Returns:
+            Tuple[float, List[Event]]: The time of the events and the events, \
+            in the order `pop` would have returned them.
+        """
+        heap = self._heap
+        time, _, _, event = heappop(heap)
+        events = [event]
+        while heap and heap[0][0] == time:
+            events.append(heappop(heap)[3])
+        return time, events
+
+    def peek(self) -> Tuple[float, Event]:
+        """
+        Return the earliest event in the queue without removing it.
+
+        Returns:
+            Tuple[float, Event]: The time of the event and the event.
+        """
+        time, _, _, event = self._heap[0]
+        return time, event
+
+    def __len__(self) -> int:
+        """Return the number of pending events."""
+        return len(self._heap)
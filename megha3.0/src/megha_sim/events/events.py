@@ -9,15 +9,17 @@ Raises:
 """
 
 from __future__ import annotations
-from io import TextIOWrapper
+from itertools import groupby
+from operator import attrgetter
 from typing import List, Optional, Tuple, TYPE_CHECKING
 import sys
 from job import Job
+from workload import JobRecord, TraceReader
 from task import Task
 from simulation_logger import SimulationLogger
 import simulator_utils.globals
 from simulator_utils.values import (LM_HEARTBEAT_INTERVAL, NETWORK_DELAY,
-                                    InconsistencyType,
+                                    EventPriority, InconsistencyType,
                                     TaskDurationDistributions)
 import os
 import sys
@@ -40,10 +42,16 @@ class Event(object):
     """
     This is the abstract `Event` object class.
 
+    Every subclass sets `PRIORITY` to its `EventPriority` class, which decides \
+    the order in which events sharing a timestamp are run. The simulation \
+    hands all events of one type at a timestamp to `run_batch` together.
+
     Args:
         object (Object): Parent object class.
     """
 
+    PRIORITY: int
+
     def __init__(self):
         """
         One cannot initialise the object of the abstract class `Event`.
@@ -58,19 +66,6 @@ class Event(object):
         raise NotImplementedError(
             "Event is an abstract class and cannot be instantiated directly")
 
-    def __lt__(self, other: Event) -> bool:
-        """
-        Compare the `Event` object with another object of `Event` class.
-
-        Args:
-            other (Event): The object to compare with.
-
-        Returns:
-            bool: The Event object is always lesser than the object it is \
-            compared with.
-        """
-        return True
-
     def run(self, current_time: float):
         """
         Run the actions to handle the `Event`.
@@ -87,6 +82,30 @@ class Event(object):
             "The run() method must be implemented by each class subclassing "
             "Event")
 
+    @classmethod
+    def run_batch(cls, events: List[Event], current_time: float):
+        """
+        Run the actions to handle a batch of events of this type.
+
+        All the events in the batch share `current_time` and are in the order \
+        they were taken off the event queue. By default, each event is run in \
+        turn. Subclasses override this to handle the whole batch in one pass.
+
+        Args:
+            events (List[Event]): The events of this type to run.
+            current_time (float): The current time in the simulation.
+
+        Returns:
+            List[Tuple[float, Event]]: Any events that should be added to the \
+            queue.
+        """
+        new_events: List[Tuple[float, Event]] = []
+        for event in events:
+            event_new_events = event.run(current_time)
+            if event_new_events:
+                new_events.extend(event_new_events)
+        return new_events
+
 
 ##########################################################################
 ##########################################################################
@@ -102,6 +121,8 @@ class TaskEndEvent(Event):
             Event (Event): Parent Event class.
     """
 
+    PRIORITY: int = EventPriority.TASK_END
+
     def __init__(self, task: Task):
         """
         Initialise the instance of the `TaskEndEvent` class.
@@ -112,19 +133,6 @@ class TaskEndEvent(Event):
         """
         self.task: Task = task
 
-    def __lt__(self, other: Event) -> bool:
-        """
-        Compare the `TaskEndEvent` object with another object of Event class.
-
-        Args:
-                other (Event): The object to compare with.
-
-        Returns:
-                bool: The `TaskEndEvent` object is always lesser than the \
-                object it is compared with.
-        """
-        return True
-
     def run(self, current_time: float):
         """
         Run the actions to perform on the event of task completion.
@@ -143,6 +151,33 @@ class TaskEndEvent(Event):
         if self.task.lm is not None:
             self.task.lm.task_completed(self.task)
 
+    @classmethod
+    def run_batch(cls, events: List[TaskEndEvent], current_time: float):
+        """
+        Run the actions to perform on the completion of a batch of tasks.
+
+        Consecutive tasks running under the same Local Master are handed to \
+        it in a single `LM.tasks_completed` call.
+
+        Args:
+            events (List[TaskEndEvent]): The events of the tasks completed at \
+            `current_time`.
+            current_time (float): The current time in the simulation.
+        """
+        completed_tasks = []
+        for event in events:
+            task = event.task
+            logger.info(f"{current_time} , "
+                        "TaskEndEvent , "
+                        f"{task.job.job_id} , "
+                        f"{task.task_id} , "
+                        f"{task.duration}")
+            task.end_time = current_time
+            if task.lm is not None:
+                completed_tasks.append(task)
+        for lm, tasks in groupby(completed_tasks, key=attrgetter("lm")):
+            lm.tasks_completed(list(tasks))
+
 ###############################################################################
 ###############################################################################
 
@@ -159,6 +194,8 @@ class LaunchOnNodeEvent(Event):
             Event (Event): Parent Event class.
     """
 
+    PRIORITY: int = EventPriority.LAUNCH_ON_NODE
+
     def __init__(self, task: Task, simulation: Simulation):
         """
         Initialise the instance of the `LaunchOnNodeEvent` class.
@@ -197,8 +234,33 @@ class LaunchOnNodeEvent(Event):
         # print(current_time,"LaunchOnNodeEvent","job:",self.task.job.job_id,"task:",self.task.task_id,"node:",self.task.node_id,"LM:",self.task.lm.LM_id,"GM:",self.task.GM_id)
 
         # launching requires network transfer
-        self.simulation.event_queue.put(
-            (current_time + self.task.duration, TaskEndEvent(self.task)))
+        self.simulation.event_queue.push(
+            current_time + self.task.duration, TaskEndEvent(self.task))
+
+    @classmethod
+    def run_batch(cls, events: List[LaunchOnNodeEvent], current_time: float):
+        """
+        Run the actions to handle a batch of `LaunchOnNodeEvent`s.
+
+        Args:
+            events (List[LaunchOnNodeEvent]): The events of the tasks launched \
+            at `current_time`.
+            current_time (float): The current time in the simulation.
+        """
+        for event in events:
+            task = event.task
+            assert task.node_id is not None
+            logger.info(
+                f"{current_time} , "
+                "LaunchOnNodeEvent , "
+                f"{task.job.job_id} , "
+                f"{task.task_id} , "
+                f"{task.partition_id} , "
+                f"{task.node_id} , "
+                f"{task.duration} , "
+                f"{task.job.start_time}")
+        return [(current_time + event.task.duration, TaskEndEvent(event.task))
+                for event in events]
 
 
 ##########################################################################
@@ -216,6 +278,8 @@ class InconsistencyEvent(Event):
         Event (Event): Parent Event class.
     """
 
+    PRIORITY: int = EventPriority.INCONSISTENCY
+
     def __init__(self, task: Task, gm: GM,lm: LM,status,
                  simulation: Simulation):
         """
@@ -269,6 +333,8 @@ class BatchedInconsistencyEvent(Event):
         Event (Event): Parent Event class.
     """
 
+    PRIORITY: int = EventPriority.BATCHED_INCONSISTENCY
+
     def __init__(self, inconsistent_task_mappings: List, gm: GM, lm: LM,
                  simulation: Simulation, lm_update):
         """
@@ -318,6 +384,8 @@ class VerifyRequestsEvent(Event):
         Event (Event): Parent Event class.
     """
 
+    PRIORITY: int = EventPriority.VERIFY_REQUESTS
+
     def __init__(
             self,
             task_mappings: List,
@@ -378,6 +446,8 @@ class VerifyRequestEvent(Event):
         Event (Event): Parent Event class.
     """
 
+    PRIORITY: int = EventPriority.VERIFY_REQUEST
+
     def __init__(
             self,
             task: Task,
@@ -434,6 +504,8 @@ class TaskResponseEvent(Event):
     execution and that it has released resources
     """
 
+    PRIORITY: int = EventPriority.TASK_RESPONSE
+
     def __init__(self,simulation: Simulation,gm: GM,task: Task):
         self.simulation=simulation
         self.gm=gm
@@ -451,6 +523,8 @@ class LMStatusUpdateEvent(Event):
         Event (Event): Parent `Event` class.
     """
 
+    PRIORITY: int = EventPriority.LM_STATUS_UPDATE
+
     def __init__(self,status,simulation: Simulation,lm):
         """
         Initialise the instance of the `LMRequestUpdateEvent` class.
@@ -468,7 +542,7 @@ class LMStatusUpdateEvent(Event):
         self.status=status
         
     def run(self, current_time: float):
-        for GM_id in self.simulation.gms:
+        for GM_id in self.status:
             # print(current_time,GM_id,"callin lm status update")
             self.simulation.gms[GM_id].update_status(self.lm,self.status[GM_id],current_time)
         
@@ -484,6 +558,8 @@ class LMRequestUpdateEvent(Event):
         Event (Event): Parent `Event` class.
     """
 
+    PRIORITY: int = EventPriority.LM_REQUEST_UPDATE
+
     def __init__(self, simulation: Simulation):
         """
         Initialise the instance of the `LMRequestUpdateEvent` class.
@@ -505,6 +581,11 @@ class LMRequestUpdateEvent(Event):
         # Log the LMRequestUpdateEvent
         logger.info(f"{current_time} , LMRequestUpdateEvent")
 
+        adaptive = self.simulation.HEARTBEAT_MODE == "adaptive"
+        if adaptive:
+            # The LMs queue the next round once they have changes to send
+            self.simulation.heartbeat_queued = False
+            self.simulation.last_heartbeat_time = current_time
         
         are_jobs_done = True
         for GM_id in self.simulation.gms:
@@ -519,14 +600,19 @@ class LMRequestUpdateEvent(Event):
                 # print(GM_id,"Resources available:",self.simulation.gms[GM_id].internal_available_nodes)
                 break
 
-        if not are_jobs_done or not self.simulation.event_queue.empty():
+        if (not are_jobs_done or self.simulation.event_queue or
+                self.simulation.pending_batch_events):
             for LM_id in self.simulation.lms:
+                if adaptive and not self.simulation.lms[LM_id].changed_GMs:
+                    self.simulation.suppressed_status_updates += 1
+                    continue
                 self.simulation.lms[LM_id].send_status_update(
                     current_time)
 
-            self.simulation.event_queue.put(
-                (current_time + LM_HEARTBEAT_INTERVAL,
-                 self))#add the next request
+            if not adaptive:
+                self.simulation.event_queue.push(
+                    current_time + LM_HEARTBEAT_INTERVAL,
+                    self)#add the next request
 
 ##########################################################################
 ##########################################################################
@@ -541,12 +627,13 @@ class JobArrivalEvent(Event):
         Event (Event): Parent `Event` class.
     """
 
+    PRIORITY: int = EventPriority.JOB_ARRIVAL
     gm_counter: int = 0
 
     def __init__(self, simulation: Simulation,
                  task_distribution: TaskDurationDistributions,
-                 job: Job,
-                 jobs_file: TextIOWrapper):
+                 job_record: JobRecord,
+                 trace_reader: TraceReader):
         """
         Initialise the instance of the `JobArrival` class.
 
@@ -555,26 +642,16 @@ class JobArrivalEvent(Event):
             into.
             task_distribution (TaskDurationDistributions): Select the \
             distribution of the duration/run-time of the tasks of the Job
-            job (Job): The Job object that has arrived into the user queue.
-            jobs_file (TextIOWrapper): File handle to the input trace file.
+            job_record (JobRecord): The job that arrives into the user \
+            queue, as read from the trace. Its `Job` and `Task` objects are \
+            only built when the event runs.
+            trace_reader (TraceReader): Reader over the jobs of the input \
+            trace file.
         """
         self.simulation = simulation
         self.task_distribution = task_distribution
-        self.job = job
-        self.jobs_file = jobs_file  # Jobs file (input trace file) handler
-
-    def __lt__(self, other: Event) -> bool:
-        """
-        Compare the `JobArrival` object with another object of Event class.
-
-        Args:
-            other (Event): The object to compare with.
-
-        Returns:
-            bool: The `JobArrival` object is always lesser than the object \
-                  it is compared with.
-        """
-        return True
+        self.job_record = job_record
+        self.trace_reader = trace_reader  # Input trace file reader
 
     def run(self, current_time: float):
         """
@@ -594,15 +671,18 @@ class JobArrivalEvent(Event):
 
         # assigned_GM --> Handle to the global master object
         assigned_GM: GM = self.simulation.gms[str(JobArrivalEvent.gm_counter)]
+        # The job and its tasks are only built now that it is dispatched
+        job = Job(self.task_distribution, self.job_record, self.simulation)
         # GM needs to add job to its queue
-        assigned_GM.schedule_job_batched_all(self.job, current_time)
+        assigned_GM.schedule_job_batched_all(job, current_time)
 
-        # Creating a new Job Arrival event for the next job in the trace
-        line = self.jobs_file.readline()
-        if len(line) == 0:
+        # Reusing this event for the next job in the trace
+        job_record = next(self.trace_reader, None)
+        if job_record is None:
+            self.job_record = None
             self.simulation.scheduled_last_job = True
         else:
-            self.job = Job(self.task_distribution, line, self.simulation)
-            new_events.append((self.job.start_time, self))
+            self.job_record = job_record
+            new_events.append((self.job_record.start_time, self))
             self.simulation.jobs_scheduled += 1
         return new_events
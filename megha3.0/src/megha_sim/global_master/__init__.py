@@ -1,2 +1,6 @@
-
 from .gm_constraints_rand import GM
+from .cluster_model import (ClusterModel, cluster_model_cache_file,
+                            compile_cluster_model, load_cluster_model)
+from .feasibility import FeasibilityOracle, maximal_constraint_sets
+from .cluster_view import (CLUSTER_VIEWS, BitArrayClusterView,
+                           PackedClusterView)
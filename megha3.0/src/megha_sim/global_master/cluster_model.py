@@ -0,0 +1,278 @@
+"""
+File containing the compiled cluster model of the Global Masters.
+
+The cluster configuration gives, for every partition of every LM, one "0b" \
+string per constraint with the character of each node of the partition set \
+when the node has the constraint. Every GM needs these vectors, the \
+constraint bitmask of each node and, for the `Simulation`, the list of the \
+distinct node constraint sets. `compile_cluster_model` parses the strings \
+once into a `ClusterModel` holding all of them, which the GMs share and \
+never change. The LMs read their partition layout from the same model, so \
+no component keeps a copy of the config.
+
+`load_cluster_model` caches the compiled model in a file next to the config, \
+so that later runs read it instead of parsing the config. The cache is keyed \
+by the SHA-1 of the config's content, and is compiled again when the config \
+changes.
+
+Cache file layout (little-endian):
+
+    header      magic, version, SHA-1 of the config, number of LMs, number \
+of partitions per LM, partition size, number of constraints, number of \
+constraint sets, length of the IDs
+    IDs         UTF-8, the LM IDs then the partition IDs of each LM, \
+separated by newlines
+    vectors     uint8[], each constraint vector packed with node 0 as the \
+most significant bit of its first byte
+    masks       uint64[], constraint bitmask of every node
+    sets        uint64[number of constraint sets]
+"""
+
+from array import array
+from hashlib import sha1
+import json
+import os
+import struct
+import sys
+from typing import Dict, List, Optional, Tuple
+from typing_extensions import Final
+
+from bitstring import BitArray
+
+from .gm_types import ConfigFile
+
+CLUSTER_MODEL_MAGIC: Final[bytes] = b"MEGHAMDL"
+CLUSTER_MODEL_VERSION: Final[int] = 1
+# magic, version, config digest, LMs, partitions per LM, partition size,
+# constraints, constraint sets, length of the IDs
+CLUSTER_MODEL_HEADER: Final[struct.Struct] = struct.Struct("<8sI20sIIIIII")
+# The node bitmasks are cached as uint64
+MAX_CACHED_CONSTRAINTS: Final[int] = 64
+
+
+def _byteswap_if_big_endian(column: array) -> None:
+	if sys.byteorder == "big":
+		column.byteswap()
+
+
+def cluster_model_cache_file(config_file: str) -> str:
+	"""Return the path of the cluster model cache kept next to a config."""
+	return config_file + ".model"
+
+
+class ClusterModel(object):
+	"""
+	Constraint vectors, node bitmasks and constraint sets of a cluster.
+
+	The model is shared by the GMs and the LMs and must not be changed.
+
+	Args:
+		object (object): This is the parent object class
+	"""
+
+	def __init__(self, partition_size: int, num_constraints: int,
+				 partition_ids: Dict[str, List[str]],
+				 vectors: Dict[Tuple[str, str], List[bytes]],
+				 node_masks: Dict[str, Dict[str, List[int]]],
+				 constraint_sets: List[int]):
+		"""
+		Initialise the instance of the ClusterModel class.
+
+		Args:
+			partition_size (int): Number of nodes in a partition.
+			num_constraints (int): Number of constraint vectors of each \
+			partition.
+			partition_ids (Dict[str, List[str]]): IDs of the partitions of \
+			each LM, both in the order of the config.
+			vectors (Dict[Tuple[str, str], List[bytes]]): Packed constraint \
+			vectors of each (LM_id, partition_id), node 0 first.
+			node_masks (Dict[str, Dict[str, List[int]]]): Constraint bitmask \
+			of each node, indexed as [LM_id][partition_id][node_id].
+			constraint_sets (List[int]): Bitmasks of the distinct node \
+			constraint sets, none a subset of an earlier one.
+		"""
+		self.partition_size = partition_size
+		self.num_constraints = num_constraints
+		self.partition_ids = partition_ids
+		self.LM_ids = list(partition_ids)
+		self.vectors = vectors
+		self.node_masks = node_masks
+		# Number of constraints of each node, [LM_id][partition_id][node_id]
+		self.node_constraint_counts = {
+			LM_id: {partition_id: [bin(mask).count("1") for mask in masks]
+					for partition_id, masks in LM_masks.items()}
+			for LM_id, LM_masks in node_masks.items()}
+		self.constraint_sets = constraint_sets
+
+	def constraint_bitarrays(self, LM_id: str,
+							 partition_id: str) -> List[BitArray]:
+		"""Return the constraint vectors of a partition as `BitArray`s."""
+		# The bytes of a vector are padded to a whole byte
+		return [BitArray(vector)[:self.partition_size]
+				for vector in self.vectors[(LM_id, partition_id)]]
+
+
+def compile_cluster_model(config: ConfigFile) -> ClusterModel:
+	"""
+	Parse the constraint vectors of a cluster configuration.
+
+	Args:
+		config (ConfigFile): The cluster configuration, with the constraint \
+		vectors of each partition as "0b" strings.
+
+	Returns:
+		ClusterModel: The compiled model.
+	"""
+	LMs = config["LMs"]
+	partition_size = len(LMs["1"]["partitions"]["1"][0]) - 2  # for the "0b"
+	num_bytes = -(-partition_size // 8)
+	padding = num_bytes * 8 - partition_size
+	partition_ids: Dict[str, List[str]] = dict()
+	vectors: Dict[Tuple[str, str], List[bytes]] = dict()
+	node_masks: Dict[str, Dict[str, List[int]]] = dict()
+	for LM_id in LMs:
+		partition_ids[LM_id] = list(LMs[LM_id]["partitions"])
+		node_masks[LM_id] = dict()
+		for partition_id, constraint_vectors in \
+				LMs[LM_id]["partitions"].items():
+			vectors[(LM_id, partition_id)] = [
+				(int(constraint_vector, 2) << padding).to_bytes(num_bytes,
+																"big")
+				for constraint_vector in constraint_vectors]
+			masks = [0] * partition_size
+			for constraint, constraint_vector in enumerate(constraint_vectors):
+				bit = 1 << constraint
+				for node_id, node_bit in enumerate(constraint_vector[2:]):
+					if node_bit == "1":
+						masks[node_id] |= bit
+			node_masks[LM_id][partition_id] = masks
+
+	# Distinct constraint sets, in the order the Simulation lists them: LMs
+	# and partitions by number, and a set only if it is not a subset of an
+	# earlier one
+	constraint_sets: List[int] = list()
+	for LM_number in range(1, len(LMs) + 1):
+		for GM_number in range(1, len(LMs["1"]["partitions"]) + 1):
+			for mask in node_masks[str(LM_number)][str(GM_number)]:
+				if not any((mask & ~constraint_set) == 0
+						   for constraint_set in constraint_sets):
+					constraint_sets.append(mask)
+
+	num_constraints = len(LMs["1"]["partitions"]["1"])
+	return ClusterModel(partition_size, num_constraints, partition_ids,
+						vectors, node_masks, constraint_sets)
+
+
+def _read_cache(cache_file: str, digest: bytes) -> Optional[ClusterModel]:
+	with open(cache_file, "rb") as file:
+		header = file.read(CLUSTER_MODEL_HEADER.size)
+		if len(header) != CLUSTER_MODEL_HEADER.size:
+			return None
+		(magic, version, cache_digest, num_LMs, num_partitions, partition_size,
+		 num_constraints, num_sets, ids_length) = \
+			CLUSTER_MODEL_HEADER.unpack(header)
+		if (magic != CLUSTER_MODEL_MAGIC
+				or version != CLUSTER_MODEL_VERSION
+				or cache_digest != digest):
+			# Compiled from another config, it is overwritten
+			return None
+		ids = file.read(ids_length).decode().split("\n")
+		num_vectors = num_LMs * num_partitions * num_constraints
+		num_bytes = -(-partition_size // 8)
+		vector_data = file.read(num_vectors * num_bytes)
+		if len(vector_data) != num_vectors * num_bytes:
+			return None
+		masks = array("Q")
+		masks.fromfile(file, num_LMs * num_partitions * partition_size)
+		constraint_sets = array("Q")
+		constraint_sets.fromfile(file, num_sets)
+	_byteswap_if_big_endian(masks)
+	_byteswap_if_big_endian(constraint_sets)
+
+	partition_ids: Dict[str, List[str]] = dict()
+	vectors: Dict[Tuple[str, str], List[bytes]] = dict()
+	node_masks: Dict[str, Dict[str, List[int]]] = dict()
+	LM_ids = ids[:num_LMs]
+	vector_start = 0
+	mask_start = 0
+	for index, LM_id in enumerate(LM_ids):
+		start = num_LMs + index * num_partitions
+		partition_ids[LM_id] = ids[start:start + num_partitions]
+		node_masks[LM_id] = dict()
+		for partition_id in partition_ids[LM_id]:
+			vectors[(LM_id, partition_id)] = [
+				vector_data[offset:offset + num_bytes]
+				for offset in range(vector_start,
+									vector_start + num_constraints * num_bytes,
+									num_bytes)]
+			vector_start += num_constraints * num_bytes
+			node_masks[LM_id][partition_id] = \
+				masks[mask_start:mask_start + partition_size].tolist()
+			mask_start += partition_size
+	return ClusterModel(partition_size, num_constraints, partition_ids,
+						vectors, node_masks, constraint_sets.tolist())
+
+
+def _write_cache(model: ClusterModel, cache_file: str, digest: bytes) -> None:
+	if model.num_constraints > MAX_CACHED_CONSTRAINTS:
+		return
+	ids = list(model.LM_ids)
+	for LM_id in model.LM_ids:
+		ids.extend(model.partition_ids[LM_id])
+	ids_data = "\n".join(ids).encode()
+	num_partitions = len(model.partition_ids[model.LM_ids[0]])
+	vector_data = b"".join(vector for LM_id in model.LM_ids
+						   for partition_id in model.partition_ids[LM_id]
+						   for vector in model.vectors[(LM_id, partition_id)])
+	masks = array("Q", [mask for LM_id in model.LM_ids
+						for partition_id in model.partition_ids[LM_id]
+						for mask in model.node_masks[LM_id][partition_id]])
+	constraint_sets = array("Q", model.constraint_sets)
+	temporary_file = cache_file + ".tmp"
+	try:
+		with open(temporary_file, "wb") as file:
+			file.write(CLUSTER_MODEL_HEADER.pack(
+				CLUSTER_MODEL_MAGIC, CLUSTER_MODEL_VERSION, digest,
+				len(model.LM_ids), num_partitions, model.partition_size,
+				model.num_constraints, len(constraint_sets), len(ids_data)))
+			file.write(ids_data)
+			file.write(vector_data)
+			for column in (masks, constraint_sets):
+				_byteswap_if_big_endian(column)
+				column.tofile(file)
+		# Replace the old cache only once the new one is complete
+		os.replace(temporary_file, cache_file)
+	except OSError as error:
+		# The cache only saves time, so a run does not fail without it
+		print(f"Could not save the cluster model cache: {error}",
+			  file=sys.stderr)
+
+
+def load_cluster_model(config_file: str,
+					   cache_file: Optional[str] = None) -> ClusterModel:
+	"""
+	Return the compiled model of a cluster configuration file.
+
+	Args:
+		config_file (str): Path of the cluster configuration.
+		cache_file (Optional[str], optional): File to read the compiled \
+		model from, and to save it to if it is missing or was compiled from \
+		another config. Defaults to None, for no caching.
+
+	Returns:
+		ClusterModel: The compiled model.
+	"""
+	with open(config_file, "rb") as file:
+		config_data = file.read()
+	digest = sha1(config_data).digest()
+	if cache_file is not None and os.path.exists(cache_file):
+		try:
+			model = _read_cache(cache_file, digest)
+		except EOFError:  # Truncated, it is overwritten
+			model = None
+		if model is not None:
+			return model
+	model = compile_cluster_model(json.loads(config_data))
+	if cache_file is not None:
+		_write_cache(model, cache_file, digest)
+	return model
@@ -0,0 +1,333 @@
+"""
+File containing the cluster views of the Global Master.
+
+A GM keeps, for every (LM, partition) pair, a vector of the nodes it believes \
+to be free and one vector per constraint with the bits of the nodes having \
+that constraint set. The cluster view stores these vectors and provides the \
+few operations the GM and the `NodeSelector` make on them, so that the \
+storage can be selected by name in `Simulation`:
+
+- `bitarray` (`BitArrayClusterView`, default): one `BitArray` per vector.
+- `packed` (`PackedClusterView`): the availability of all the partitions is \
+one NumPy matrix of packed `uint64` words with a row per (LM, partition) \
+pair, and the constraint vectors are one matrix of such rows per pair. A \
+constraint signature is matched with one vectorized AND over the rows of its \
+constraints, and status updates set all the bits of a partition in one call. \
+It needs NumPy.
+
+Both views give the same nodes for the same operations, so the choice does \
+not change the results of a run. The vectors they return are only handed \
+back to the view or combined with `&`.
+"""
+
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+from typing_extensions import Final
+
+from bitstring import BitArray
+
+try:
+	import numpy as np
+except ImportError:  # NumPy is optional, only the packed view needs it
+	np = None
+
+from .cluster_model import ClusterModel
+
+# Number of node bits in each word of a packed row
+WORD_SIZE: Final[int] = 64
+
+
+class BitArrayClusterView(object):
+	"""
+	Cluster view storing each vector as a `BitArray`.
+
+	Args:
+		object (object): This is the parent object class
+	"""
+
+	def __init__(self, cluster_model: ClusterModel):
+		"""
+		Initialise the view with every node of the cluster free.
+
+		Args:
+			cluster_model (ClusterModel): The compiled cluster configuration.
+		"""
+		self.partition_size = cluster_model.partition_size
+		self.available_nodes: Dict[Tuple[str, str], BitArray] = dict()
+		self.constraint_vectors: Dict[Tuple[str, str], List[BitArray]] = dict()
+		for LM_id in cluster_model.LM_ids:
+			for partition_id in cluster_model.partition_ids[LM_id]:
+				key = (LM_id, partition_id)
+				self.available_nodes[key] = self.full_vector()
+				self.constraint_vectors[key] = \
+					cluster_model.constraint_bitarrays(LM_id, partition_id)
+
+	def full_vector(self) -> BitArray:
+		"""Return a vector with the bit of every node of a partition set."""
+		return BitArray("0b" + "1" * self.partition_size)
+
+	def vector(self, node_ids: Iterable[int]) -> BitArray:
+		"""Return a vector with the bits of the given nodes set."""
+		vector = BitArray("0b" + "0" * self.partition_size)
+		vector.set(True, list(node_ids))
+		return vector
+
+	def candidates(self, LM_id: str, partition_id: str,
+				   constraints: List[int]) -> BitArray:
+		"""
+		Return the nodes of a partition that have all the given constraints.
+
+		Args:
+			LM_id (str): ID of the LM the partition belongs to.
+			partition_id (str): ID of the partition.
+			constraints (List[int]): The constraints to satisfy.
+
+		Returns:
+			BitArray: Vector with the bit of each satisfying node set.
+		"""
+		constraint_vectors = self.constraint_vectors[(LM_id, partition_id)]
+		candidate_vector = self.full_vector()
+		for constraint in constraints:
+			candidate_vector = candidate_vector & constraint_vectors[constraint]
+		return candidate_vector
+
+	def has_free_nodes(self, LM_id: str, partition_id: str) -> bool:
+		"""Return whether any node of a partition is free."""
+		return self.available_nodes[(LM_id, partition_id)].any(True)
+
+	def free_candidates(self, LM_id: str, partition_id: str,
+						candidate_vector: BitArray) -> Optional[BitArray]:
+		"""
+		Return the free nodes of a partition among the candidate nodes.
+
+		Args:
+			LM_id (str): ID of the LM the partition belongs to.
+			partition_id (str): ID of the partition.
+			candidate_vector (BitArray): Vector of the candidate nodes.
+
+		Returns:
+			Optional[BitArray]: Vector of the free candidates, or None if \
+			there are none.
+		"""
+		free_vector = candidate_vector & self.available_nodes[(LM_id,
+															   partition_id)]
+		if not free_vector.any(True):
+			return None
+		return free_vector
+
+	def set_node(self, LM_id: str, partition_id: str, node_id: int,
+				 free: bool) -> None:
+		"""Mark a node of a partition as free or busy."""
+		self.available_nodes[(LM_id, partition_id)][node_id] = free
+
+	def set_nodes(self, LM_id: str, partition_id: str,
+				  node_ids: List[int], free: bool) -> None:
+		"""Mark several nodes of a partition as free or busy."""
+		if node_ids:
+			self.available_nodes[(LM_id, partition_id)].set(free, node_ids)
+
+	def set_busy_nodes(self, LM_id: str, partition_id: str,
+					   node_bitmap: int) -> None:
+		"""Mark the nodes set in a bitmap, bit i for node i, as busy."""
+		if node_bitmap:
+			busy_vector = BitArray(uint=node_bitmap, length=self.partition_size)
+			busy_vector.reverse()  # bit i of the bitmap is the i-th bit
+			self.available_nodes[(LM_id, partition_id)] &= ~busy_vector
+
+	def any(self, vector: BitArray) -> bool:
+		"""Return whether any bit of a vector is set."""
+		return vector.any(True)
+
+	def count(self, vector: BitArray) -> int:
+		"""Return the number of bits set in a vector."""
+		return vector.count(1)
+
+	def first_node(self, vector: BitArray) -> Optional[int]:
+		"""Return the lowest node set in a vector, or None if it is empty."""
+		# findall rather than find, whose result differs between bitstring
+		# versions
+		return next(vector.findall("0b1"), None)
+
+	def nth_node(self, vector: BitArray, rank: int) -> int:
+		"""Return the node of the set bit of the given rank in a vector."""
+		return next(islice(vector.findall("0b1"), rank, None))
+
+
+class PackedClusterView(object):
+	"""
+	Cluster view storing the vectors as rows of packed `uint64` words.
+
+	Node i of a partition is bit i % 64 of word i // 64 of a row. The bits \
+	past the last node of a row are always clear.
+
+	Args:
+		object (object): This is the parent object class
+	"""
+
+	def __init__(self, cluster_model: ClusterModel):
+		"""
+		Initialise the view with every node of the cluster free.
+
+		Args:
+			cluster_model (ClusterModel): The compiled cluster configuration.
+
+		Raises:
+			ImportError: This exception is raised when NumPy is not \
+			installed.
+		"""
+		if np is None:
+			raise ImportError("the packed cluster view needs NumPy")
+		partition_size = cluster_model.partition_size
+		self.partition_size = partition_size
+		self.num_words = -(-partition_size // WORD_SIZE)
+		# bit_masks[i] has bit i set, for the bit of a node within its word
+		self.bit_masks = np.left_shift(np.uint64(1),
+									   np.arange(WORD_SIZE, dtype=np.uint64))
+		self.full_row = self.vector(range(partition_size))
+
+		# (LM_id, partition_id) -> row of the partition in the matrices
+		self.rows: Dict[Tuple[str, str], int] = dict()
+		constraint_rows = list()
+		for LM_id in cluster_model.LM_ids:
+			for partition_id in cluster_model.partition_ids[LM_id]:
+				self.rows[(LM_id, partition_id)] = len(constraint_rows)
+				constraint_rows.append([self._pack(constraint_vector)
+										for constraint_vector in
+										cluster_model.vectors[(LM_id,
+															   partition_id)]])
+		# [row, constraint, word]
+		self.constraint_matrix = np.array(constraint_rows, dtype=np.uint64)
+		# [row, word]
+		self.available_nodes = np.tile(self.full_row, (len(self.rows), 1))
+
+	def _pack(self, constraint_vector: bytes) -> "np.ndarray":
+		# vector of the cluster model, node 0 first -> packed row
+		bits = np.unpackbits(np.frombuffer(constraint_vector, dtype=np.uint8),
+							 count=self.partition_size)
+		row = np.zeros(self.num_words * 8, dtype=np.uint8)
+		packed = np.packbits(bits, bitorder="little")
+		row[:len(packed)] = packed
+		return row.view("<u8").astype(np.uint64)
+
+	def _unpack(self, vector: "np.ndarray") -> "np.ndarray":
+		# packed row -> one uint8 per node
+		return np.unpackbits(vector.astype("<u8").view(np.uint8),
+							 count=self.partition_size, bitorder="little")
+
+	def full_vector(self) -> "np.ndarray":
+		"""Return a vector with the bit of every node of a partition set."""
+		return self.full_row.copy()
+
+	def vector(self, node_ids: Iterable[int]) -> "np.ndarray":
+		"""Return a vector with the bits of the given nodes set."""
+		vector = np.zeros(self.num_words, dtype=np.uint64)
+		node_ids = np.fromiter(node_ids, dtype=np.intp)
+		np.bitwise_or.at(vector, node_ids // WORD_SIZE,
+						 self.bit_masks[node_ids % WORD_SIZE])
+		return vector
+
+	def candidates(self, LM_id: str, partition_id: str,
+				   constraints: List[int]) -> "np.ndarray":
+		"""
+		Return the nodes of a partition that have all the given constraints.
+
+		Args:
+			LM_id (str): ID of the LM the partition belongs to.
+			partition_id (str): ID of the partition.
+			constraints (List[int]): The constraints to satisfy.
+
+		Returns:
+			np.ndarray: Vector with the bit of each satisfying node set.
+		"""
+		if not constraints:
+			return self.full_vector()
+		return np.bitwise_and.reduce(
+			self.constraint_matrix[self.rows[(LM_id, partition_id)],
+								   constraints], axis=0)
+
+	def has_free_nodes(self, LM_id: str, partition_id: str) -> bool:
+		"""Return whether any node of a partition is free."""
+		row = self.rows[(LM_id, partition_id)]
+		return bool(self.available_nodes[row].any())
+
+	def free_candidates(self, LM_id: str, partition_id: str,
+						candidate_vector: "np.ndarray"
+						) -> Optional["np.ndarray"]:
+		"""
+		Return the free nodes of a partition among the candidate nodes.
+
+		Args:
+			LM_id (str): ID of the LM the partition belongs to.
+			partition_id (str): ID of the partition.
+			candidate_vector (np.ndarray): Vector of the candidate nodes.
+
+		Returns:
+			Optional[np.ndarray]: Vector of the free candidates, or None if \
+			there are none.
+		"""
+		free_vector = candidate_vector & self.available_nodes[
+			self.rows[(LM_id, partition_id)]]
+		if not free_vector.any():
+			return None
+		return free_vector
+
+	def set_node(self, LM_id: str, partition_id: str, node_id: int,
+				 free: bool) -> None:
+		"""Mark a node of a partition as free or busy."""
+		row = self.available_nodes[self.rows[(LM_id, partition_id)]]
+		word = node_id // WORD_SIZE
+		if free:
+			row[word] |= self.bit_masks[node_id % WORD_SIZE]
+		else:
+			row[word] &= ~self.bit_masks[node_id % WORD_SIZE]
+
+	def set_nodes(self, LM_id: str, partition_id: str,
+				  node_ids: List[int], free: bool) -> None:
+		"""Mark several nodes of a partition as free or busy."""
+		if not node_ids:
+			return
+		row = self.available_nodes[self.rows[(LM_id, partition_id)]]
+		node_ids = np.asarray(node_ids, dtype=np.intp)
+		bit_masks = self.bit_masks[node_ids % WORD_SIZE]
+		# ufunc.at, so that nodes sharing a word are all applied
+		if free:
+			np.bitwise_or.at(row, node_ids // WORD_SIZE, bit_masks)
+		else:
+			np.bitwise_and.at(row, node_ids // WORD_SIZE, ~bit_masks)
+
+	def set_busy_nodes(self, LM_id: str, partition_id: str,
+					   node_bitmap: int) -> None:
+		"""Mark the nodes set in a bitmap, bit i for node i, as busy."""
+		if node_bitmap:
+			# The little-endian bytes of the bitmap are the words of a row
+			busy_row = np.frombuffer(
+				node_bitmap.to_bytes(self.num_words * 8, "little"), dtype="<u8")
+			self.available_nodes[self.rows[(LM_id, partition_id)]] &= ~busy_row
+
+	def any(self, vector: "np.ndarray") -> bool:
+		"""Return whether any bit of a vector is set."""
+		return bool(vector.any())
+
+	def count(self, vector: "np.ndarray") -> int:
+		"""Return the number of bits set in a vector."""
+		return int(np.count_nonzero(self._unpack(vector)))
+
+	def first_node(self, vector: "np.ndarray") -> Optional[int]:
+		"""Return the lowest node set in a vector, or None if it is empty."""
+		words = np.flatnonzero(vector)
+		if not len(words):
+			return None
+		word = int(words[0])
+		bits = int(vector[word])
+		return word * WORD_SIZE + (bits & -bits).bit_length() - 1
+
+	def nth_node(self, vector: "np.ndarray", rank: int) -> int:
+		"""Return the node of the set bit of the given rank in a vector."""
+		return int(np.flatnonzero(self._unpack(vector))[rank])
+
+
+# Cluster views selectable by name in `Simulation`
+CLUSTER_VIEWS: Final[Dict[str, type]] = {
+	"bitarray": BitArrayClusterView,
+	"packed": PackedClusterView,
+}
@@ -0,0 +1,76 @@
+"""
+File containing the feasibility oracle of the Global Masters.
+
+A task whose constraints no node of the cluster satisfies is dropped by the \
+GM. Deciding this meant testing the task's constraint bitmask against every \
+distinct node constraint set of the cluster. The `FeasibilityOracle` keeps \
+only the maximal sets, those not a subset of another set, since a task fits \
+some node iff its constraints are a subset of one of them, and remembers \
+the answer for every constraint signature it has seen. After the first task \
+of a signature the check is a dictionary lookup.
+"""
+
+from typing import Dict, List
+
+
+def maximal_constraint_sets(constraint_sets: List[int]) -> List[int]:
+	"""
+	Return the constraint sets that are not a subset of another set.
+
+	Args:
+		constraint_sets (List[int]): Bitmasks of the constraint sets.
+
+	Returns:
+		List[int]: The distinct maximal sets, in the order they are first \
+		given.
+	"""
+	maximal_sets: List[int] = list()
+	for constraint_set in dict.fromkeys(constraint_sets):
+		if not any((constraint_set & ~other_set) == 0
+				   and constraint_set != other_set
+				   for other_set in constraint_sets):
+			maximal_sets.append(constraint_set)
+	return maximal_sets
+
+
+class FeasibilityOracle(object):
+	"""
+	Memoized test of whether any node of the cluster satisfies a task.
+
+	Args:
+		object (object): This is the parent object class
+	"""
+
+	def __init__(self, constraint_sets: List[int]):
+		"""
+		Initialise the instance of the FeasibilityOracle class.
+
+		Args:
+			constraint_sets (List[int]): Bitmasks of the node constraint sets \
+			of the cluster.
+		"""
+		self.maximal_sets = maximal_constraint_sets(constraint_sets)
+		# constraint signature -> whether a node satisfies it
+		self.feasible: Dict[int, bool] = dict()
+		self.hits = 0
+		self.misses = 0
+
+	def is_feasible(self, constraints: int) -> bool:
+		"""
+		Return whether any node of the cluster satisfies the constraints.
+
+		Args:
+			constraints (int): Constraint bitmask of the task.
+
+		Returns:
+			bool: True if some node has all the constraints.
+		"""
+		feasible = self.feasible.get(constraints)
+		if feasible is not None:
+			self.hits += 1
+			return feasible
+		self.misses += 1
+		feasible = any((constraints & ~constraint_set) == 0
+					   for constraint_set in self.maximal_sets)
+		self.feasible[constraints] = feasible
+		return feasible
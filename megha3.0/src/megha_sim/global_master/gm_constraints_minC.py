@@ -8,25 +8,28 @@ modified scheduler architecture.
 from __future__ import annotations
 import json
 import random
-from typing import List, Dict, TYPE_CHECKING
-from bitstring import BitArray
+from collections import OrderedDict
+from typing import Dict, Set, Tuple, TYPE_CHECKING
 
 import simulator_utils.globals
 from simulator_utils import debug_print
 from simulator_utils.values import (LM_HEARTBEAT_INTERVAL, NETWORK_DELAY,
-									InconsistencyType,
+									CANDIDATE_CACHE_SIZE, InconsistencyType,
 									TaskDurationDistributions)
 from events import VerifyRequestEvent,VerifyRequestsEvent
 from simulation_logger import (SimulationLogger, MATCHING_LOGIC_MSG,
 							   CLUSTER_SATURATED_MSG,
 							   MATCHING_LOGIC_REPARTITION_MSG)
-from .gm_types import (PartitionKey, LMResources, ConfigFile,
-					   OrganizedPartitionResources, NodeResources,
-					   PartitionResources)
+from workload import mask_to_constraints
+from .cluster_model import ClusterModel
+from .cluster_view import CLUSTER_VIEWS
+from .node_selection import NodeSelector
+from .task_queue import TaskQueue
+from .gm_types import (LMResources, OrganizedPartitionResources,
+					   NodeResources, PartitionResources)
 from watchpoints import watch
 # Imports used only for type checking go here to avoid circular imports
 if TYPE_CHECKING:
-	from job import Job
 	from local_master import LM
 
 # Seed the random number generator
@@ -54,59 +57,44 @@ class GM:
 	# Starting value for the seeds for the Random objects
 	SEED_VALUE = 42
 
-	def __init__(self, simulation, GM_id: str, config: ConfigFile,WORKER_CONSTRAINTS_SET):
+	def __init__(self, simulation, GM_id: str, cluster_model: ClusterModel):
 		self.GM_id = GM_id
 		self.jobs={}
 		self.simulation = simulation
-		self.task_queue: List[Job] = []
+		self.task_queue = TaskQueue()
 		self.random_obj = random.Random()
 		self.random_obj.seed(GM.SEED_VALUE)
-		self.PARTITON_SIZE=len(config["LMs"]["1"]["partitions"]["1"][0])-2 #to get rid of 0b
-		self.WORKER_CONSTRAINTS_VECTOR=dict()#does not change [LM_id][partition_id][constraint_index]
-		self.WORKER_CONSTRAINTS=dict()
-		self.WORKER_CONSTRAINTS_SET=WORKER_CONSTRAINTS_SET
+		self.PARTITON_SIZE=cluster_model.partition_size
+		# shared with the other GMs, none of them change these
+		self.WORKER_CONSTRAINTS=cluster_model.node_masks#constraint bitmask per node [LM_id][partition_id][node_id]
+		self.WORKER_CONSTRAINT_COUNTS=cluster_model.node_constraint_counts#number of constraints per node [LM_id][partition_id][node_id]
+		# whether any node satisfies a constraint signature, shared by the GMs
+		self.feasibility=simulation.feasibility_oracle
+		# (LM_id, partition_id, constraint signature) -> nodes of the partition
+		# satisfying the signature, in least recently used order
+		self.candidate_cache: OrderedDict = OrderedDict()
+		# (LM_id, partition_id, constraint signature) of the signatures no node
+		# of the partition satisfies
+		self.no_match: Set[Tuple[str, str, int]] = set()
 		GM.SEED_VALUE += 13
 		
-		self.internal_available_nodes = dict()
-		self.external_available_nodes = dict()
+		# free nodes and constraint vectors of every (LM_id, partition_id)
+		self.cluster_view=CLUSTER_VIEWS[simulation.CLUSTER_VIEW](cluster_model)
 		self.external_busy_partitions=set()
 		self.internal_busy_partitions=set()
 		
-		self.LMs_list=list(config["LMs"].keys())
-		self.GMs_list=list(config["LMs"]["1"]["partitions"].keys())
-		for LM_id in config["LMs"]:
-			
-			self.external_available_nodes[LM_id]=dict()
-			self.WORKER_CONSTRAINTS_VECTOR[LM_id]=dict()
-			for partition_id in config["LMs"][LM_id]["partitions"]:
-				self.WORKER_CONSTRAINTS_VECTOR[LM_id][partition_id]=list()
-				for constraint_vector in config["LMs"][LM_id]["partitions"][partition_id]:
-					self.WORKER_CONSTRAINTS_VECTOR[LM_id][partition_id].append(BitArray(constraint_vector))
-				if partition_id==self.GM_id:
-					self.internal_available_nodes[LM_id]=BitArray("0b"+'1'*self.PARTITON_SIZE)
-				else:
-					self.external_available_nodes[LM_id][partition_id]=BitArray("0b"+'1'*self.PARTITON_SIZE)
-
-				#populate per worker constraints dictionary
-				with open("logs/node_constraints.txt", "a") as file:	
-					for node_id in range(0,self.PARTITON_SIZE):
-						key=LM_id+"_"+partition_id+"_"+str(node_id)
-						constraints=self.get_node_constraints(node_id,self.WORKER_CONSTRAINTS_VECTOR[LM_id][partition_id])
-						self.WORKER_CONSTRAINTS[key]=constraints
-						file.write(key+",")
-						file.write(",".join(str(constraint) for constraint in constraints ))
-						file.write("\n")
+		self.LMs_list=cluster_model.LM_ids
+		self.GMs_list=cluster_model.partition_ids["1"]
+		for LM_id in cluster_model.LM_ids:
+			for partition_id in cluster_model.partition_ids[LM_id]:
+				for node_id,mask in enumerate(self.WORKER_CONSTRAINTS[LM_id][partition_id]):
+					key=LM_id+"_"+partition_id+"_"+str(node_id)
+					simulation.results.write("node_constraints.txt",key,",".join(str(constraint) for constraint in mask_to_constraints(mask)))
 
 		# print(self.WORKER_CONSTRAINTS)
+		self.node_selector=NodeSelector(self.WORKER_CONSTRAINT_COUNTS,self.cluster_view)
 		debug_print(f"GM {self.GM_id} initialised")
 
-	def get_node_constraints(self,node_id,partition):
-		node_constraints=list()
-		for constraint,constraint_vector in enumerate(partition):
-			if constraint_vector[node_id]:
-				node_constraints.append(constraint)
-		return node_constraints
-
 
 	def schedule_job_batched_all(self, job, current_time):
 		job.gm = self
@@ -125,13 +113,9 @@ class GM:
 			mode="E"
 		# print("Mode:",mode,self.internal_busy_partitions,self.external_busy_partitions)
 		for task_id in self.jobs[job_id].tasks:
-			flag=False
 			task=self.jobs[job_id].tasks[task_id]
-			for constraint_set in self.WORKER_CONSTRAINTS_SET:
-				if set(task.constraints).issubset(constraint_set):
-					flag=True
-					break
-			if not flag:
+			task_constraints=task.constraints
+			if not self.feasibility.is_feasible(task_constraints):
 				delete_task_ids.append(task_id)
 				# print(self.GM_id,"TASK HAS NO RESOURCES SATISFYING CONSTRAINTS",task.job.job_id,task.task_id)
 				continue
@@ -165,35 +149,35 @@ class GM:
 				prev_LM=task_mapping_request["LM_id"]
 				task_mapping_request_batch.append(task_mapping_request)
 			else:
-				self.simulation.event_queue.put(
-					(current_time+NETWORK_DELAY, VerifyRequestsEvent(
+				self.simulation.event_queue.push(
+					current_time+NETWORK_DELAY, VerifyRequestsEvent(
 					task_mapping_request_batch,
 					self,
 					self.simulation.lms[prev_LM],
-					)))
+					))
 				prev_LM=task_mapping_request["LM_id"]
 				task_mapping_request_batch=[]
 				task_mapping_request_batch.append(task_mapping_request)
 
 
 			if len(task_mapping_request_batch)==100:
-				self.simulation.event_queue.put(
-					(current_time+NETWORK_DELAY, VerifyRequestsEvent(
+				self.simulation.event_queue.push(
+					current_time+NETWORK_DELAY, VerifyRequestsEvent(
 					task_mapping_request_batch,
 					self,
 					self.simulation.lms[prev_LM],
-					)))
+					))
 				prev_LM=None
 				task_mapping_request_batch=[]
 
 		#if all tasks done processing, send batch
 		if task_mapping_request_batch:
-			self.simulation.event_queue.put(
-					(current_time+NETWORK_DELAY, VerifyRequestsEvent(
+			self.simulation.event_queue.push(
+					current_time+NETWORK_DELAY, VerifyRequestsEvent(
 					task_mapping_request_batch,
 					self,
 					self.simulation.lms[prev_LM],
-					)))
+					))
 
 		#delete tasks whose constraints cannot be satisfied by the DC
 		for task_id in delete_task_ids:
@@ -203,29 +187,52 @@ class GM:
 				print(self.GM_id,"JOB DELETED",job_id)
 			
 
-	def find_constraint_match(self,availability_vector,partition_constraints,task,LM_id,partition_id):
-		#do bitwise and across constraint vectors for constraints in task
-		resultant_vector=BitArray("0b"+"1"*self.PARTITON_SIZE)
-		for constraint in task.constraints:
-			resultant_vector= resultant_vector & partition_constraints[constraint]
-		if resultant_vector.int == 0: # no nodes with required constraints in the cluster
-			task.no_match.add((LM_id,partition_id))
-		resultant_vector=resultant_vector&availability_vector
-		suitable_nodes=[i for i, bit in enumerate(resultant_vector) if bit]
-		return suitable_nodes
+	def candidate_nodes(self,LM_id,partition_id,signature):
+		"""
+		Return the nodes of a partition that satisfy a constraint signature.
+
+		The vectors are kept in a cache of at most `CANDIDATE_CACHE_SIZE` \
+		entries, evicting the least recently used one. A signature that no \
+		node of the partition satisfies is also added to `no_match`.
+
+		Args:
+			LM_id (str): ID of the LM the partition belongs to.
+			partition_id (str): ID of the partition.
+			signature (int): Bitmask of the constraints of a task.
+
+		Returns:
+			Vector of the cluster view with the bit of each satisfying node set.
+		"""
+		key=(LM_id,partition_id,signature)
+		candidate_vector=self.candidate_cache.get(key)
+		if candidate_vector is not None:
+			self.candidate_cache.move_to_end(key)
+			return candidate_vector
+		#do bitwise and across constraint vectors for constraints in the signature
+		candidate_vector=self.cluster_view.candidates(LM_id,partition_id,mask_to_constraints(signature))
+		if not self.cluster_view.any(candidate_vector): # no nodes with required constraints in the cluster
+			self.no_match.add(key)
+		self.candidate_cache[key]=candidate_vector
+		if len(self.candidate_cache)>CANDIDATE_CACHE_SIZE:
+			self.candidate_cache.popitem(last=False)
+		return candidate_vector
+
+	def find_constraint_match(self,task,LM_id,partition_id):
+		#vector of the available nodes satisfying the task, None if there are none
+		return self.cluster_view.free_candidates(LM_id,partition_id,self.candidate_nodes(LM_id,partition_id,task.constraints))
 
 
 	def schedule_task(self, current_time: float,task):
 		suitable_nodes=False
 		suitable_LM=False
 		for LM_id in self.LMs_list:
-			if((LM_id,self.GM_id) in task.no_match):
+			if((LM_id,self.GM_id,task.constraints) in self.no_match):
 				continue
 			if LM_id in self.internal_busy_partitions:
 				continue
-			if self.internal_available_nodes[LM_id].int!=0:
-				suitable_nodes=self.find_constraint_match(self.internal_available_nodes[LM_id],self.WORKER_CONSTRAINTS_VECTOR[LM_id][self.GM_id],task,LM_id,self.GM_id)
-				if suitable_nodes:
+			if self.cluster_view.has_free_nodes(LM_id,self.GM_id):
+				suitable_nodes=self.find_constraint_match(task,LM_id,self.GM_id)
+				if suitable_nodes is not None:
 					suitable_LM=LM_id
 					break
 			else:
@@ -234,23 +241,16 @@ class GM:
 
 		if not suitable_LM:
 			return None
-		min_constraints=10000
-		min_node=None
-		for node_id in suitable_nodes:
-			constraint_len=len(self.WORKER_CONSTRAINTS[suitable_LM+"_"+self.GM_id+"_"+str(node_id)])
-			if min_constraints> constraint_len:
-				min_constraints=constraint_len
-				min_node=node_id
 		# node_id=random.choice(suitable_nodes)
-		node_id=min_node
-		self.internal_available_nodes[suitable_LM][node_id]=False
+		node_id=self.node_selector.fewest_constraints(suitable_nodes,suitable_LM,self.GM_id)
+		self.cluster_view.set_node(suitable_LM,self.GM_id,node_id,False)
 		task_id=task.task_id
 		task.node_id=node_id
 		task.partition_id=self.GM_id
 		task.GM_id=self.GM_id
 		task.lm=self.simulation.lms[suitable_LM]
 		# print(self.GM_id,"Mapping found:",task,suitable_LM,self.GM_id,node_id)
-		# print(self.GM_id,self.internal_available_nodes)
+		# print(self.GM_id,self.cluster_view.available_nodes)
 		return {"task":task,"LM_id":suitable_LM}
 
 	
@@ -261,13 +261,13 @@ class GM:
 			for GM_id in self.GMs_list:
 				if GM_id==self.GM_id:
 					continue
-				if((LM_id,GM_id) in task.no_match):
+				if((LM_id,GM_id,task.constraints) in self.no_match):
 					continue
 				if(LM_id+"_"+GM_id in self.external_busy_partitions):
 					continue
-				if self.external_available_nodes[LM_id][GM_id].int !=0:
-					suitable_nodes=self.find_constraint_match(self.external_available_nodes[LM_id][GM_id],self.WORKER_CONSTRAINTS_VECTOR[LM_id][GM_id],task,LM_id,GM_id)	
-					if suitable_nodes:
+				if self.cluster_view.has_free_nodes(LM_id,GM_id):
+					suitable_nodes=self.find_constraint_match(task,LM_id,GM_id)	
+					if suitable_nodes is not None:
 						suitable_partition=(LM_id,GM_id)
 						break
 				else:
@@ -278,17 +278,10 @@ class GM:
 		if not suitable_partition:
 			return None
 		else:
-			min_constraints=10000
-			min_node=None
-			for node_id in suitable_nodes:
-				constraint_len=len(self.WORKER_CONSTRAINTS[suitable_partition[0]+"_"+suitable_partition[1]+"_"+str(node_id)])
-				if min_constraints> constraint_len:
-					min_constraints=constraint_len
-					min_node=node_id
 			# node_id=random.choice(suitable_nodes)
-			node_id=min_node
+			node_id=self.node_selector.fewest_constraints(suitable_nodes,suitable_partition[0],suitable_partition[1])
 
-			self.external_available_nodes[suitable_partition[0]][suitable_partition[1]][node_id]=False
+			self.cluster_view.set_node(suitable_partition[0],suitable_partition[1],node_id,False)
 			task_id=task.task_id
 			job=task.job
 			task.node_id=node_id
@@ -296,7 +289,7 @@ class GM:
 			task.GM_id=self.GM_id
 			task.lm=self.simulation.lms[suitable_partition[0]]
 			# print(self.GM_id,"External mapping found:",task,suitable_partition[0],suitable_partition[1],node_id)
-			# print(self.GM_id,self.external_available_nodes)
+			# print(self.GM_id,self.cluster_view.available_nodes)
 			return{"task":task,"LM_id":suitable_partition[0]}
 
 	
@@ -308,9 +301,17 @@ class GM:
 		if completed_task in job.completed_tasks:
 			print("Error. Duplication.", task.task_id,job.job_id)
 			exit()
-		with open("logs/tasks.txt", "a") as file:
-				file.write(job.job_id+","+completed_task.task_id+","+str(completed_task.start_time))
-				file.write(","+str(current_time)+"\n")
+		results_format=self.simulation.RESULTS_FORMAT
+		if results_format=="text":
+			self.simulation.results.write("tasks.txt",job.job_id,completed_task.task_id,completed_task.start_time,current_time)
+		elif results_format=="npz":
+			self.simulation.result_columns.add("tasks",job.job_id,completed_task.task_id,completed_task.start_time,
+							   completed_task.scheduled_time,current_time,completed_task.lm.LM_id,
+							   completed_task.partition_id,completed_task.node_id,
+							   completed_task.scheduling_attempts,completed_task.inconsistencies)
+		statistics=self.simulation.result_statistics
+		if statistics is not None:
+			statistics.add("queueing delay",job.is_short,completed_task.scheduled_time-completed_task.start_time)
 		job.completed_tasks.append(completed_task)
 		# print(self.GM_id,current_time,",TC,",completed_task,completed_task.lm.LM_id,completed_task.partition_id,completed_task.node_id)
 		del self.jobs[job_id].tasks[completed_task.task_id]
@@ -320,91 +321,83 @@ class GM:
 			assert job.completion_time is not None
 			job.completion_time = current_time
 			job.end_time = job.completion_time
-			with open("logs/JRT.txt", "a") as file:
-				file.write(str(current_time)+",")
-				file.write(job.job_id+",")
-				file.write(str(current_time-job.start_time-job.ideal_completion_time))
-				file.write("\n")
+			if results_format=="text":
+				self.simulation.results.write("JRT.txt",current_time,job.job_id,current_time-job.start_time-job.ideal_completion_time)
+			elif results_format=="npz":
+				self.simulation.result_columns.add("jobs",current_time,job.job_id,current_time-job.start_time-job.ideal_completion_time)
+			if statistics is not None:
+				statistics.add("JRT",job.is_short,current_time-job.start_time-job.ideal_completion_time)
 			GM.jobs_completed+=1
 			print(self.GM_id,self.GM_id,current_time,",JC,",job_id,",",job.completion_time-job.start_time-job.ideal_completion_time)
 
 
 		#match free resource to a pending task to reduce complexity
 		if(self.task_queue):
-			node_constraints=self.WORKER_CONSTRAINTS[completed_task.lm.LM_id+"_"+completed_task.partition_id+"_"+str(completed_task.node_id)]
-			for task_index in range(0,len(self.task_queue)):
-				new_task=self.task_queue[task_index]
-
-				if set(new_task.constraints).issubset(node_constraints):
-					new_job=new_task.job
-					key = PartitionKey(gm_id=completed_task.partition_id, lm_id=completed_task.lm.LM_id)
-					self.task_queue.pop(task_index)
-					new_task.partition_id=completed_task.partition_id
-					new_task.GM_id=self.GM_id
-					new_task.node_id=completed_task.node_id
-					new_task.lm=self.simulation.lms[completed_task.lm.LM_id]
-					# print(self.GM_id,"TC matched:",new_task,new_task.lm.LM_id,new_task.partition_id,new_task.node_id)
-					self.simulation.event_queue.put(
-						(current_time+NETWORK_DELAY, VerifyRequestsEvent(
-						[{"task":new_task,"LM_id":completed_task.lm.LM_id}],
-						self,
-						self.simulation.lms[completed_task.lm.LM_id]
-						)))
-					return
+			node_constraints=self.WORKER_CONSTRAINTS[completed_task.lm.LM_id][completed_task.partition_id][completed_task.node_id]
+			new_task=self.task_queue.pop_compatible(node_constraints)
+			if new_task is not None:
+				new_task.partition_id=completed_task.partition_id
+				new_task.GM_id=self.GM_id
+				new_task.node_id=completed_task.node_id
+				new_task.lm=self.simulation.lms[completed_task.lm.LM_id]
+				# print(self.GM_id,"TC matched:",new_task,new_task.lm.LM_id,new_task.partition_id,new_task.node_id)
+				self.simulation.event_queue.push(
+					current_time+NETWORK_DELAY, VerifyRequestsEvent(
+					[{"task":new_task,"LM_id":completed_task.lm.LM_id}],
+					self,
+					self.simulation.lms[completed_task.lm.LM_id]
+					))
+				return
 
 		#free resources - no takers
 		#or - no tasks waiting in the queue
 
+		self.cluster_view.set_node(completed_task.lm.LM_id,completed_task.partition_id,completed_task.node_id,True)
 		if(completed_task.partition_id==self.GM_id):
-			self.internal_available_nodes[completed_task.lm.LM_id][completed_task.node_id]=True
 			self.internal_busy_partitions.discard(completed_task.lm.LM_id)
 		else:
-			self.external_available_nodes[completed_task.lm.LM_id][completed_task.partition_id][completed_task.node_id]=True
 			self.external_busy_partitions.discard(completed_task.lm.LM_id+"_"+completed_task.partition_id)
 	
 	def update_status(self,lm:LM,latest_LM_config,current_time):
 
 		LM_id=lm.LM_id
-		flag=False
+		# constraint bitmasks of the nodes no queued task is compatible with.
+		# The queue only shrinks here, so later nodes with the same
+		# constraints are not matched against it again
+		unmatched_constraints=set()
 		for partition_id in latest_LM_config:
-			busy_nodes=latest_LM_config[partition_id]["busy"]
-			for node_id in busy_nodes:
-				if partition_id==self.GM_id:
-					self.internal_available_nodes[LM_id][node_id]=False
-				else:
-					self.external_available_nodes[LM_id][partition_id][node_id]=False
+			self.cluster_view.set_busy_nodes(LM_id,partition_id,latest_LM_config[partition_id]["busy"])
 
 			available_nodes=latest_LM_config[partition_id]["available"]
+			partition_constraints=self.WORKER_CONSTRAINTS[LM_id][partition_id]
+			free_nodes=[]# available nodes no queued task is matched to
 			for node_id in available_nodes:
-				task_index=0
-				flag=False
-				while task_index <len(self.task_queue):
-					task=self.task_queue[task_index]
-					node_constraints=self.WORKER_CONSTRAINTS[LM_id+"_"+partition_id+"_"+str(node_id)]
-					if set(task.constraints).issubset(node_constraints):
-						flag=True
-						key = PartitionKey(gm_id=partition_id, lm_id=LM_id)
-						self.task_queue.pop(task_index)
-						task.node_id=node_id
-						task.partition_id=partition_id
-						task.GM_id=self.GM_id
-						task.lm=self.simulation.lms[LM_id]
-						# print(self.GM_id,"US:",task,task.lm.LM_id,task.partition_id,task.node_id)
-						self.simulation.event_queue.put(
-							(current_time+NETWORK_DELAY, VerifyRequestsEvent(
-							[{"task":task,"LM_id":LM_id}],
-							self,
-							self.simulation.lms[LM_id]
-							)))
-						break	 
-					task_index+=1
-				if not flag:# no match found:
-					if partition_id==self.GM_id:
-						self.internal_available_nodes[LM_id][node_id]=True
-						self.internal_busy_partitions.discard(LM_id)
-					else:
-						self.external_available_nodes[LM_id][partition_id][node_id]=True
-						self.external_busy_partitions.discard(LM_id+"_"+partition_id)
+				node_constraints=partition_constraints[node_id]
+				if node_constraints in unmatched_constraints:
+					free_nodes.append(node_id)
+					continue
+				task=self.task_queue.pop_compatible(node_constraints)
+				if task is None:# no match found:
+					unmatched_constraints.add(node_constraints)
+					free_nodes.append(node_id)
+					continue
+				task.node_id=node_id
+				task.partition_id=partition_id
+				task.GM_id=self.GM_id
+				task.lm=self.simulation.lms[LM_id]
+				# print(self.GM_id,"US:",task,task.lm.LM_id,task.partition_id,task.node_id)
+				self.simulation.event_queue.push(
+					current_time+NETWORK_DELAY, VerifyRequestsEvent(
+					[{"task":task,"LM_id":LM_id}],
+					self,
+					self.simulation.lms[LM_id]
+					))
+			if free_nodes:
+				self.cluster_view.set_nodes(LM_id,partition_id,free_nodes,True)
+				if partition_id==self.GM_id:
+					self.internal_busy_partitions.discard(LM_id)
+				else:
+					self.external_busy_partitions.discard(LM_id+"_"+partition_id)
 						
 
 	def unschedule_task(self, unverified_task: Task):
@@ -415,4 +408,4 @@ class GM:
 		unverified_task.node_id=None
 		unverified_task.lm=None
 		# print(self.GM_id,"Inconsistent:",unverified_task)
-		self.task_queue.insert(0,unverified_task)
\ No newline at end of file
+		self.task_queue.appendleft(unverified_task)
\ No newline at end of file
@@ -39,6 +39,21 @@ class ConfigFile(TypedDict):
     LMs: Dict[str, LMResources]
 
 
+class PartitionStatusUpdate(TypedDict):
+    """
+    Typed dictionary class to describe the changes to the nodes of a \
+    partition that an LM has not sent to a GM yet.
+
+    Args:
+        TypedDict (TypedDict): TypedDict base class.
+    """
+
+    # nodes that became available, in the order they did
+    available: List[int]
+    # bitmap of the nodes that became busy, bit i for node i
+    busy: int
+
+
 class PartitionKey(NamedTuple):
     gm_id: str
     lm_id: str
@@ -0,0 +1,96 @@
+"""
+File containing the node selection of the Global Master.
+
+`GM.find_constraint_match` returns a vector of the free nodes of a partition \
+that satisfy a task. Rather than listing every set bit of that vector and \
+looping over the list, the `NodeSelector` picks the node straight from the \
+vector:
+
+- fewest constraints (`gm_constraints_minC`): the nodes of each partition \
+are grouped into one vector per number of constraints, and the first set bit \
+of the match vector ANDed with each group's vector is searched, from the \
+group with the fewest constraints up. This returns the lowest indexed of the \
+nodes with the fewest constraints.
+- random (`gm_constraints_rand`): an index below the number of set bits of \
+the match vector is drawn, and the set bit with that rank is selected.
+"""
+
+from random import Random
+from typing import Dict, List, Optional
+
+
+class NodeSelector(object):
+	"""
+	Selects the node a task is mapped to among the nodes matching it.
+
+	Args:
+		object (object): This is the parent object class
+	"""
+
+	def __init__(self, worker_constraint_counts: Dict[str, Dict[str, List[int]]],
+				 cluster_view):
+		"""
+		Initialise the instance of the NodeSelector class.
+
+		Args:
+			worker_constraint_counts (Dict[str, Dict[str, List[int]]]): \
+			Number of constraints of each node, indexed as \
+			[LM_id][partition_id][node_id].
+			cluster_view (BitArrayClusterView or PackedClusterView): The \
+			cluster view of the GM, whose vectors are selected from.
+		"""
+		self.cluster_view = cluster_view
+		# [LM_id][partition_id] -> one vector per number of constraints, with
+		# the bits of the nodes having that many constraints set, fewest first
+		self.count_vectors: Dict[str, Dict[str, list]] = dict()
+		for LM_id in worker_constraint_counts:
+			self.count_vectors[LM_id] = dict()
+			for partition_id, counts in worker_constraint_counts[LM_id].items():
+				self.count_vectors[LM_id][partition_id] = [
+					cluster_view.vector(node_id for node_id, node_count
+										in enumerate(counts)
+										if node_count == count)
+					for count in sorted(set(counts))]
+
+	def fewest_constraints(self, match_vector, LM_id: str,
+						   partition_id: str) -> Optional[int]:
+		"""
+		Return the lowest indexed matching node with the fewest constraints.
+
+		Args:
+			match_vector (BitArray or np.ndarray): Vector of the matching \
+			nodes.
+			LM_id (str): ID of the LM the partition belongs to.
+			partition_id (str): ID of the partition.
+
+		Returns:
+			Optional[int]: The node, or None if no node matches.
+		"""
+		for count_vector in self.count_vectors[LM_id][partition_id]:
+			node_id = self.cluster_view.first_node(match_vector & count_vector)
+			if node_id is not None:
+				return node_id
+		return None
+
+	def uniform(self, match_vector, random_obj: Random) -> Optional[int]:
+		"""
+		Return a matching node picked uniformly at random.
+
+		The node is drawn with `random_obj.choice` over the ranks of the set \
+		bits, which makes the same draw as `random_obj.choice` over the list \
+		of matching nodes.
+
+		Args:
+			match_vector (BitArray or np.ndarray): Vector of the matching \
+			nodes.
+			random_obj (Random): Generator to draw the node with, or the \
+			`random` module for the global one.
+
+		Returns:
+			Optional[int]: The node, or None if no node matches.
+		"""
+		num_nodes = self.cluster_view.count(match_vector)
+		if num_nodes == 0:
+			return None
+		return self.cluster_view.nth_node(match_vector,
+										  random_obj.choice(range(num_nodes)))
@@ -0,0 +1,154 @@
+"""
+File containing the task queue of the Global Master.
+
+Tasks that cannot be mapped when they arrive wait in the task queue of the \
+GM, and whenever a node is freed the oldest queued task that the node \
+satisfies is mapped to it. With a plain list, every freed node scans the \
+queue from the front and removes the task from the middle of the list, both \
+in time linear in the length of the queue.
+
+`TaskQueue` instead keeps the tasks in one FIFO bucket per constraint \
+signature, each task tagged with its position in the queue. For every node \
+class (the nodes with the same constraints) it keeps a heap of the positions \
+of the first tasks of the buckets whose signature the class satisfies, so \
+the oldest compatible task is found at the top of that heap. The heaps are \
+updated lazily:
+
+- an entry may hold a position older than the first task of its bucket, or \
+a bucket that has since been emptied, and it is corrected when it reaches \
+the top.
+- buckets becoming non-empty, or getting a task in front of their first \
+task, are logged, and a class adds the logged buckets it satisfies to its \
+heap the next time one of its nodes is freed.
+
+Tasks are returned in exactly the order of the list based queue.
+"""
+
+from __future__ import annotations
+from collections import deque
+from heapq import heapify, heappop, heappush, heapreplace, merge
+from itertools import count
+from typing import Deque, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from simulator_utils.values import TASK_QUEUE_LOG_SIZE
+
+# Imports used only for type checking go here to avoid circular imports
+if TYPE_CHECKING:
+	from task import Task
+
+
+class TaskQueue(object):
+	"""
+	Queue of the tasks waiting for a node, indexed by constraint signature.
+
+	Args:
+		object (object): This is the parent object class
+	"""
+
+	def __init__(self):
+		"""Initialise an empty task queue."""
+		# constraint signature -> (position, task) of its tasks, oldest first
+		self.buckets: Dict[int, Deque[Tuple[int, Task]]] = dict()
+		self.back_positions = count()
+		self.front_positions = count(-1, -1)
+		self.size = 0
+		# signatures of the buckets whose first task got older
+		self.log: List[int] = []
+		# node signature -> heap of (position, task signature)
+		self.heaps: Dict[int, List[Tuple[int, int]]] = dict()
+		# node signature -> index of the first log entry not in its heap yet
+		self.log_positions: Dict[int, int] = dict()
+
+	def _add(self, task: Task, position: int, at_front: bool) -> None:
+		signature = task.constraints
+		bucket = self.buckets.get(signature)
+		if bucket is None:
+			bucket = self.buckets[signature] = deque()
+			self._log(signature)
+		elif at_front:
+			self._log(signature)
+		if at_front:
+			bucket.appendleft((position, task))
+		else:
+			bucket.append((position, task))
+		self.size += 1
+
+	def _log(self, signature: int) -> None:
+		if len(self.log) == TASK_QUEUE_LOG_SIZE:
+			# The heaps are rebuilt from the buckets rather than keeping
+			# every change
+			self.log.clear()
+			self.heaps.clear()
+			self.log_positions.clear()
+		self.log.append(signature)
+
+	def _heap(self, node_signature: int) -> List[Tuple[int, int]]:
+		# Heap of the node class, brought up to date with the log
+		buckets = self.buckets
+		heap = self.heaps.get(node_signature)
+		if heap is None:
+			heap = [(bucket[0][0], signature)
+					for signature, bucket in buckets.items()
+					if (signature & ~node_signature) == 0]
+			heapify(heap)
+			self.heaps[node_signature] = heap
+		else:
+			log = self.log
+			for index in range(self.log_positions[node_signature], len(log)):
+				signature = log[index]
+				if (signature & ~node_signature) == 0:
+					bucket = buckets.get(signature)
+					if bucket is not None:
+						heappush(heap, (bucket[0][0], signature))
+		self.log_positions[node_signature] = len(self.log)
+		return heap
+
+	def append(self, task: Task) -> None:
+		"""Add a task at the back of the queue."""
+		self._add(task, next(self.back_positions), False)
+
+	def appendleft(self, task: Task) -> None:
+		"""Add a task at the front of the queue."""
+		self._add(task, next(self.front_positions), True)
+
+	def pop_compatible(self, node_signature: int) -> Optional[Task]:
+		"""
+		Remove and return the oldest task a node satisfies.
+
+		Args:
+			node_signature (int): Bitmask of the constraints of the node.
+
+		Returns:
+			Optional[Task]: The task, or None if the node satisfies no \
+			queued task.
+		"""
+		if not self.size:
+			return None
+		buckets = self.buckets
+		heap = self._heap(node_signature)
+		while heap:
+			position, signature = heap[0]
+			bucket = buckets.get(signature)
+			if bucket is None:
+				heappop(heap)
+			elif bucket[0][0] != position:
+				heapreplace(heap, (bucket[0][0], signature))
+			else:
+				task = bucket.popleft()[1]
+				if bucket:
+					heapreplace(heap, (bucket[0][0], signature))
+				else:
+					heappop(heap)
+					del buckets[signature]
+				self.size -= 1
+				return task
+		return None
+
+	def __len__(self) -> int:
+		"""Return the number of queued tasks."""
+		return self.size
+
+	def __iter__(self) -> Iterator[Task]:
+		"""Iterate over the queued tasks, oldest first."""
+		for _, task in merge(*self.buckets.values()):
+			yield task
@@ -1,38 +1,45 @@
-import json
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 from bitstring import BitArray
 from simulator_utils.values import NETWORK_DELAY, InconsistencyType
 import simulator_utils.globals
 from simulator_utils import debug_print
 from events import LaunchOnNodeEvent,LMStatusUpdateEvent, BatchedInconsistencyEvent,InconsistencyEvent, LMRequestUpdateEvent, TaskResponseEvent
-from megha_sim.global_master.gm_types import LMResources
-import pickle
+from megha_sim.global_master.gm_types import LMResources, PartitionStatusUpdate
 
 class LM(object):
 
-	def __init__(self, simulation, LM_id, partiton_size, LM_config):
+	def __init__(self, simulation, LM_id, cluster_model):
 		self.LM_id = LM_id
-		self.partiton_size = partiton_size
+		self.partiton_size = cluster_model.partition_size
+		# availability of the nodes of each partition, the only state of the
+		# LM; the partition layout is read from the shared cluster model
 		self.LM_config = {}
-		self.LM_config["LM_id"]=LM_config["LM_id"]
+		self.LM_config["LM_id"]=LM_id
 		self.LM_config["partitions"]={}
 		self.status_update={}
-		for partition_id in LM_config["partitions"]:
+		self.changed_GMs=set()# GMs with changes in status_update
+		for partition_id in cluster_model.partition_ids[LM_id]:
 			self.LM_config["partitions"][partition_id]=BitArray("0b"+"1"*self.partiton_size)
 
 		debug_print(f"LM {LM_id} initialised")
 		self.simulation = simulation
 		for GM_id in self.simulation.gms:
-			self.status_update[GM_id]={}
-			for partition_id in LM_config["partitions"]:
-				self.status_update[GM_id][partition_id]={"available":[],"busy":[]}
+			self.status_update[GM_id]=self.new_status_update()
+
+	def new_status_update(self) -> Dict[str, PartitionStatusUpdate]:
+		# no changes yet to send to a GM, for each partition
+		return {partition_id:{"available":[],"busy":0} for partition_id in self.LM_config["partitions"]}
 	
 	def send_status_update(self,current_time):
-		self.simulation.event_queue.put((current_time + NETWORK_DELAY, LMStatusUpdateEvent(json.loads(json.dumps(self.status_update)), self.simulation,self)))
-		for GM_id in self.simulation.gms:
-			self.status_update[GM_id]={}
-			for partition_id in self.LM_config["partitions"]:
-				self.status_update[GM_id][partition_id]={"available":[],"busy":[]}
+		# The pending changes are handed over to the event as they are and
+		# the LM starts new ones, so they are sent without being copied
+		status_update=self.status_update
+		if self.simulation.HEARTBEAT_MODE=="adaptive":
+			# only the GMs with changes are sent an update
+			status_update={GM_id:status_update[GM_id] for GM_id in self.simulation.gms if GM_id in self.changed_GMs}
+		self.status_update={GM_id:self.new_status_update() for GM_id in self.simulation.gms}
+		self.changed_GMs.clear()
+		self.simulation.event_queue.push(current_time + NETWORK_DELAY, LMStatusUpdateEvent(status_update, self.simulation,self))
 
 	# # LM checks if GM's single request is valid
 	# def verify_request(self,task,gm,current_time):
@@ -58,42 +65,57 @@ class LM(object):
 		for task_mapping in task_mappings:
 			task=task_mapping["task"]
 			task.lm=self
+			task.scheduling_attempts+=1
 			node_id=int(task.node_id)
 			
 			if (self.LM_config["partitions"][task.partition_id][task.node_id]):
 				self.LM_config["partitions"][task.partition_id][task.node_id]= False
-				self.simulation.event_queue.put(
-                    (current_time + NETWORK_DELAY, LaunchOnNodeEvent(task, self.simulation)))
+				task.scheduled_time=current_time + NETWORK_DELAY  # launch time
+				self.simulation.event_queue.push(
+                    current_time + NETWORK_DELAY, LaunchOnNodeEvent(task, self.simulation))
 				for GM_id in self.simulation.gms:
 					if GM_id==task.GM_id:
 						continue
 					else:
-						self.status_update[GM_id][task.partition_id]["busy"].append(task.node_id)
+						self.status_update[GM_id][task.partition_id]["busy"]|=1<<node_id
+						self.changed_GMs.add(GM_id)
 			else:
 				
 				# print(self.LM_id,"1BatchedInconsistencyEvent:",task.job.job_id,task.task_id,self.LM_id+"_"+task.partition_id+"_"+str(task.node_id))
 				inconsistent_mappings.append(task_mapping)
-				with open("logs/inconsistencies.txt", "a") as file:
-					file.write(str(current_time)+"1\n")
+				task.inconsistencies+=1
+				self.simulation.results.write("inconsistencies.txt",str(current_time)+"1")
 		if inconsistent_mappings:
-			self.simulation.event_queue.put((current_time+ NETWORK_DELAY, BatchedInconsistencyEvent(
-					inconsistent_mappings, gm, self, self.simulation,self.status_update[gm.GM_id])))
+			self.simulation.event_queue.push(current_time+ NETWORK_DELAY, BatchedInconsistencyEvent(
+					inconsistent_mappings, gm, self, self.simulation,self.status_update[gm.GM_id]))
 			for partition_id in self.LM_config["partitions"]:
-				self.status_update[gm.GM_id][partition_id]={"available":[],"busy":[]}
+				self.status_update[gm.GM_id][partition_id]={"available":[],"busy":0}
+			self.changed_GMs.discard(gm.GM_id)
+		if self.changed_GMs:
+			self.simulation.request_heartbeat(current_time)
 
 	def task_completed(self, task):
+		self.tasks_completed([task])
+
+	def tasks_completed(self, tasks):
 		
 		# reclaim resources
-		self.LM_config["partitions"][task.partition_id][task.node_id]= True
-		for GM_id in self.simulation.gms:
-			if GM_id==task.GM_id:
-				continue
-			else:
-				self.status_update[GM_id][task.partition_id]["available"].append(task.node_id)
+		for task in tasks:
+			self.LM_config["partitions"][task.partition_id][task.node_id]= True
+			for GM_id in self.simulation.gms:
+				if GM_id==task.GM_id:
+					continue
+				else:
+					self.status_update[GM_id][task.partition_id]["available"].append(task.node_id)
+					self.changed_GMs.add(GM_id)
+		if self.changed_GMs:
+			self.simulation.request_heartbeat(tasks[0].end_time)
 		
-		self.simulation.event_queue.put((task.end_time + NETWORK_DELAY,
-										 TaskResponseEvent(
-											 self.simulation,
-											 self.simulation.gms[task.GM_id],task)))
+		self.simulation.event_queue.push_all(
+			(task.end_time + NETWORK_DELAY,
+			 TaskResponseEvent(
+				 self.simulation,
+				 self.simulation.gms[task.GM_id],task))
+			for task in tasks)
 
    
\ No newline at end of file
@@ -1,15 +1,20 @@
-import pickle
-import queue
-import json
+from itertools import groupby
 from typing import Dict
-from bitstring import BitArray
 
 from local_master import LM
-from global_master import GM
+from global_master import (GM, FeasibilityOracle, cluster_model_cache_file,
+                           load_cluster_model)
 from job import Job
+from task import Task
+from workload import (ConstraintStream, JobRecord, PrefetchTraceReader,
+                      constraint_cache_file, open_trace)
 # from simulation_logger import SimulationLogger
-from simulator_utils.values import TaskDurationDistributions
+from simulation_logger import (AsyncResultsSink, ResultColumns, ResultsSink,
+                               ResultStatistics)
+from simulator_utils.values import (LM_HEARTBEAT_INTERVAL,
+                                    TaskDurationDistributions)
 from events import JobArrivalEvent, LMRequestUpdateEvent, InconsistencyEvent
+from event_core import EVENT_QUEUE_BACKENDS
 from simulator_utils import debug_print
 
 import os
@@ -22,51 +27,91 @@ WORKLOAD_FILE_NAME = "subtrace_"+(os.path.basename(WORKLOAD_FILE)
 
 # logger = SimulationLogger(__name__,WORKLOAD_FILE_NAME).get_logger()
 
+# Columns of the tables of the columnar results, see ResultColumns
+RESULT_TABLES = {
+    "tasks": (("job_id", "U"), ("task_id", "U"), ("arrival", "d"),
+              ("launch", "d"), ("end", "d"), ("LM", "U"), ("partition", "U"),
+              ("node", "q"), ("attempts", "q"), ("inconsistencies", "q")),
+    "jobs": (("end", "d"), ("job_id", "U"), ("JRT", "d")),
+}
+
+# Values of the results_format argument
+RESULTS_FORMATS = ("text", "npz", "none")
+
+# Values of the heartbeat_mode argument
+HEARTBEAT_MODES = ("periodic", "adaptive")
+
 
 class Simulation(object):
     def __init__(
             self,
             workload,
-            config
+            config,
+            event_queue_backend="heap",
+            prefetch_jobs=0,
+            cluster_view="bitarray",
+            heartbeat_mode="periodic",
+            results_queue_depth=0,
+            results_format="text",
+            statistics=False
            ):
 
         # Each localmaster has one partition per global master so the total number of partitions in the cluster are:
         # NUM_GMS * NUM_LMS
         # Given the number of worker nodes per partition is PARTITION_SIZE
         # the total_nodes are NUM_GMS*NUM_LMS*PARTITION_SIZE
-        self.config = json.load(open(config))
         self.WORKLOAD_FILE = workload
-        self.NUM_LMS=len(self.config["LMs"])
-        self.NUM_GMS=len(self.config["LMs"]["1"]["partitions"])
-        self.PARTITION_SIZE=len(self.config["LMs"]["1"]["partitions"]["1"][0])-2 #(-2 for the "0b" string in the constraint vector)
+        self.PREFETCH_JOBS = prefetch_jobs  # 0 prepares the jobs inline
+        self.CLUSTER_VIEW = cluster_view  # storage of the GMs' node vectors
+        # "periodic": every LM sends an update every LM_HEARTBEAT_INTERVAL.
+        # "adaptive": a heartbeat round is only queued once an LM has changes
+        # to send, and only the LMs with changes send an update
+        if heartbeat_mode not in HEARTBEAT_MODES:
+            raise ValueError(f"Unknown heartbeat mode {heartbeat_mode!r}, "
+                             f"expected one of {HEARTBEAT_MODES}")
+        self.HEARTBEAT_MODE = heartbeat_mode
+        self.last_heartbeat_time = None
+        self.heartbeat_queued = False
+        self.suppressed_heartbeats = 0  # rounds never queued (adaptive)
+        self.suppressed_status_updates = 0  # LM updates not sent (adaptive)
+        # Partition layout, constraint vectors, node bitmasks and constraint
+        # sets of the cluster, shared by the GMs and LMs and cached next to
+        # the config
+        self.cluster_model = load_cluster_model(
+            config, cluster_model_cache_file(config))
+        self.NUM_LMS=len(self.cluster_model.LM_ids)
+        self.NUM_GMS=len(self.cluster_model.partition_ids["1"])
+        self.PARTITION_SIZE=self.cluster_model.partition_size
+        # whether any node satisfies a task, memoized per constraint signature
+        self.feasibility_oracle = FeasibilityOracle(
+            self.cluster_model.constraint_sets)
         self.total_nodes = self.NUM_GMS * self.NUM_LMS * self.PARTITION_SIZE
         self.task_occurrence_type={} #weights for generating task placement constraints
         self.jobs = {}
-        self.event_queue = queue.PriorityQueue()
+        self.event_queue = EVENT_QUEUE_BACKENDS[event_queue_backend]()
+        # lines of the files in logs/, formatted and written on a writer
+        # thread if results_queue_depth is not 0
+        self.results = (AsyncResultsSink(results_queue_depth)
+                        if results_queue_depth > 0 else ResultsSink())
+        # "text": the completed tasks and jobs are written to tasks.txt and
+        # JRT.txt. "npz": they are kept in typed columns and written to
+        # logs/results.npz at the end of the run. "none": they are not kept
+        if results_format not in RESULTS_FORMATS:
+            raise ValueError(f"Unknown results format {results_format!r}, "
+                             f"expected one of {RESULTS_FORMATS}")
+        self.RESULTS_FORMAT = results_format
+        self.result_columns = (ResultColumns("logs/results.npz",
+                                             RESULT_TABLES)
+                               if results_format == "npz" else None)
+        # JRT and queueing delay statistics, printed at the end of the run
+        self.result_statistics = ResultStatistics() if statistics else None
         self.job_queue=[]
         # initialise GMs
         self.gms = {}
         counter_gm = 1
-        WORKERS_CONSTRAINT_SETS=list()
-        
-        for LM_id in range(1,self.NUM_LMS+1):
-             for GM_id in range(1,self.NUM_GMS+1):   
-                for worker_id in range(0,self.PARTITION_SIZE):
-                    worker_constraints=set()
-                    for constraint,constraint_vector in enumerate(self.config["LMs"][str(LM_id)]["partitions"][str(GM_id)]):
-                        if BitArray(constraint_vector)[worker_id]:
-                            worker_constraints.add(constraint)
-                    # print(worker_constraints)
-                    flag=False
-                    for item in WORKERS_CONSTRAINT_SETS:
-                        if set(worker_constraints).issubset(item):
-                            flag=True
-                            break
-                    if not flag:
-                        WORKERS_CONSTRAINT_SETS.append(worker_constraints)
         while len(self.gms) < self.NUM_GMS:
-            self.gms[str(counter_gm)] = GM(self, str(counter_gm),pickle.loads(
-                pickle.dumps(self.config)),WORKERS_CONSTRAINT_SETS)  # create deep copy
+            self.gms[str(counter_gm)] = GM(self, str(counter_gm),
+                                           self.cluster_model)
             counter_gm += 1
 
         # initialise LMs
@@ -74,11 +119,8 @@ class Simulation(object):
         counter = 1
 
         while len(self.lms) < self.NUM_LMS:
-            self.lms[str(counter)] = LM(self,
-                                        str(counter),
-                                        self.PARTITION_SIZE,
-                                        pickle.loads(
-                                            pickle.dumps(self.config["LMs"][str(counter)])))  # create deep copy
+            self.lms[str(counter)] = LM(self, str(counter),
+                                        self.cluster_model)
             counter += 1
 
         self.shared_cluster_status = {}
@@ -86,6 +128,8 @@ class Simulation(object):
         self.jobs_scheduled = 0
         self.jobs_completed = 0
         self.scheduled_last_job = False
+        # Events of the batch being run that come after the current event type
+        self.pending_batch_events = 0
         self.tcfv={
                 "1":[8,7,7,10,23,20,30,1,3,1,4,3,2,1,4,2,9,8,11,25,29],
                 "2":[7.5,6.6,6.6,9.4,21.6,18.8,28.2,0.9,2.8,0.9,3.8,2.8,1.9,0.9,3.8,1.9,8.5,7.5,10.3,23.5,27.3],
@@ -146,39 +190,101 @@ class Simulation(object):
             self.task_occurrence_type[i]=list()
             for j in ["1","2","3","4","5","6","7","8","9","10"]:
                 self.task_occurrence_type[i].append(task_occurrence[j][i])
+
+        # Task placement constraints, cached next to the trace for later runs
+        self.constraint_stream = ConstraintStream(
+            self.task_occurrence_type, self.tcfv, Task.seed_value,
+            constraint_cache_file(self.WORKLOAD_FILE))
             
  # Simulation class
+    def prepare_job_record(self, job_record: JobRecord) -> JobRecord:
+        """
+        Do the work on a job that does not depend on the simulation state.
+
+        This dephases the start time of the job and takes the placement \
+        constraints of its tasks from the constraint stream. It is called \
+        once per job, in trace order, possibly from the trace prefetch thread.
+
+        Args:
+            job_record (JobRecord): The job as read from the input trace file.
+
+        Returns:
+            JobRecord: The job, ready to be built when it arrives.
+        """
+        job_record = Job.dephase(job_record)
+        return job_record._replace(constraints=self.constraint_stream.draw(
+            len(job_record.durations)))
+
+    def request_heartbeat(self, current_time: float) -> None:
+        """
+        Queue the next heartbeat round once an LM has changes to send.
+
+        Only the adaptive heartbeat queues rounds this way. The round is \
+        queued at the first time, at or after `current_time`, at which the \
+        periodic heartbeat would have run, and the rounds before it are \
+        counted as suppressed.
+
+        Args:
+            current_time (float): The current time in the simulation.
+        """
+        if self.HEARTBEAT_MODE != "adaptive" or self.heartbeat_queued:
+            return
+        heartbeat_time = self.last_heartbeat_time + LM_HEARTBEAT_INTERVAL
+        while heartbeat_time < current_time:
+            # Summed the way the periodic rounds are, to land on their times
+            heartbeat_time += LM_HEARTBEAT_INTERVAL
+            self.suppressed_heartbeats += 1
+        self.heartbeat_queued = True
+        self.event_queue.push(heartbeat_time, self.heartbeat)
+
     def run(self):
         last_time = 0
     
-        self.jobs_file = open(self.WORKLOAD_FILE, 'r')
+        self.trace_reader = PrefetchTraceReader(
+            open_trace(self.WORKLOAD_FILE), self.prepare_job_record,
+            self.PREFETCH_JOBS)
 
         self.task_distribution = TaskDurationDistributions.FROM_FILE
 
-        line = self.jobs_file.readline()  # first job
-        new_job = Job(self.task_distribution, line, self)
+        job_record = next(self.trace_reader)  # first job
         # starting the periodic LM updates
-        self.event_queue.put((float(line.split()[0])-0.05, LMRequestUpdateEvent(self)))
-        self.event_queue.put((float(line.split()[0]), JobArrivalEvent(
-            self, self.task_distribution, new_job, self.jobs_file)))
+        self.heartbeat = LMRequestUpdateEvent(self)
+        self.heartbeat_queued = True
+        self.event_queue.push(job_record.start_time-0.05, self.heartbeat)
+        self.event_queue.push(job_record.start_time, JobArrivalEvent(
+            self, self.task_distribution, job_record, self.trace_reader))
         
         
         self.jobs_scheduled = 1
 
-        # start processing events
-        while (not self.event_queue.empty()):
-            current_time, event = self.event_queue.get()
+        # start processing events, one batch per timestamp. Each event type
+        # in the batch is handed to its `run_batch` handler in one call.
+        while self.event_queue:
+            current_time, batch = self.event_queue.pop_batch()
             assert current_time >= last_time
             last_time = current_time
-            new_events = event.run(current_time)
-            if(new_events is None):
-                continue
-            for new_event in new_events:
-                if(new_event is None):
-                    continue
-                self.event_queue.put(new_event)
+            self.pending_batch_events = len(batch)
+            for event_type, events in groupby(batch, key=type):
+                events = list(events)
+                self.pending_batch_events -= len(events)
+                new_events = event_type.run_batch(events, current_time)
+                if new_events:
+                    self.event_queue.push_all(new_events)
 
         # print("Simulation ending, no more events")
         # logger.info("Simulator Info , Simulation ending, no more events")
-        self.jobs_file.close()
+        self.trace_reader.close()
+        self.constraint_stream.close()
+        self.results.close()
+        if self.result_columns is not None:
+            self.result_columns.close()
+        if self.result_statistics is not None:
+            print(self.result_statistics.summary())
         print("Jobs completed:",GM.jobs_completed)
+        if self.result_statistics is not None:
+            print("Feasibility checks memoized:", self.feasibility_oracle.hits,
+                  "computed:", self.feasibility_oracle.misses)
+        if self.HEARTBEAT_MODE == "adaptive":
+            print("Heartbeat rounds suppressed:", self.suppressed_heartbeats)
+            print("LM status updates suppressed:",
+                  self.suppressed_status_updates)
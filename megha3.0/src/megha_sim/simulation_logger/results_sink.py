@@ -0,0 +1,220 @@
+"""
+Buffered writer of the result files of a simulation.
+
+The simulator writes one line per task, job, node and inconsistency to the \
+files in `logs/`. Opening the file for every line costs an open, a write and \
+a close per record, which on large traces takes about as long as the \
+scheduling itself.
+
+`ResultsSink` keeps each file open for the whole run and buffers its lines \
+in memory. The lines of a file are written in one call once \
+`RESULTS_BUFFER_RECORDS` of them are buffered, when `flush` or `close` is \
+called, and when the interpreter exits, so that the lines of a run that \
+stops early are not lost. The lines of each file are written in the order \
+they are added.
+
+`AsyncResultsSink` moves the formatting and writing of the lines to a \
+writer thread. The simulation only appends the raw fields of each line to a \
+list, and hands the lists to the writer through a bounded queue, which \
+makes the simulation wait when the writer falls behind. The files are the \
+same as those written by `ResultsSink`.
+"""
+
+import atexit
+import os
+from queue import Full, Queue
+from threading import Event, Thread
+from typing import Dict, List, Optional, TextIO, Tuple
+from typing_extensions import Final
+
+from simulator_utils.values import RESULTS_BUFFER_RECORDS
+
+# Seconds the simulation waits on the writer before checking it for errors
+PUT_TIMEOUT: Final[float] = 0.1
+# Number of lines handed to the writer thread at a time
+QUEUE_CHUNK_RECORDS: Final[int] = 1024
+
+_END_OF_RESULTS = object()
+
+
+class ResultsSink(object):
+    """
+    Buffered writer of the comma separated result files of a simulation.
+
+    Args:
+        object (object): This is the parent object class
+    """
+
+    def __init__(self, directory: str = "logs",
+                 buffer_records: int = RESULTS_BUFFER_RECORDS):
+        """
+        Initialise the instance of the `ResultsSink` class.
+
+        The files are opened in append mode the first time a line is added \
+        to them, so they are expected to be truncated at the start of the \
+        run, as the runner does.
+
+        Args:
+            directory (str, optional): Directory of the result files. \
+            Defaults to "logs".
+            buffer_records (int, optional): Number of lines of a file to \
+            buffer before writing them. Defaults to RESULTS_BUFFER_RECORDS.
+        """
+        self.directory = directory
+        self.buffer_records = buffer_records
+        self.files: Dict[str, TextIO] = dict()
+        self.buffers: Dict[str, List[str]] = dict()
+        atexit.register(self.close)
+
+    def write(self, file_name: str, *fields: object) -> None:
+        """
+        Add a line of comma separated fields to a result file.
+
+        Args:
+            file_name (str): Name of the file in the results directory, \
+            e.g. "tasks.txt".
+            *fields (object): Fields of the line, written with `str`.
+        """
+        buffer = self.buffers.get(file_name)
+        if buffer is None:
+            buffer = self.buffers[file_name] = []
+        buffer.append(",".join(map(str, fields)) + "\n")
+        if len(buffer) >= self.buffer_records:
+            self._write_buffer(file_name)
+
+    def _write_buffer(self, file_name: str) -> None:
+        buffer = self.buffers[file_name]
+        if not buffer:
+            return
+        file = self.files.get(file_name)
+        if file is None:
+            file = self.files[file_name] = open(
+                os.path.join(self.directory, file_name), "a")
+        file.write("".join(buffer))
+        buffer.clear()
+
+    def flush(self) -> None:
+        """Write the buffered lines of every file."""
+        for file_name in self.buffers:
+            self._write_buffer(file_name)
+        for file in self.files.values():
+            file.flush()
+
+    def close(self) -> None:
+        """Write the buffered lines and close the files."""
+        self.flush()
+        for file in self.files.values():
+            file.close()
+        self.files.clear()
+
+
+class AsyncResultsSink(ResultsSink):
+    """
+    Results sink that formats and writes the lines on a writer thread.
+
+    Lines are queued as the file name and the raw fields, in chunks of \
+    `QUEUE_CHUNK_RECORDS` lines, and the writer adds them to the files in \
+    the order they were queued. An error on the writer thread is raised on \
+    the simulation's thread by every later call that waits on the writer. \
+    No lines may be added after `close`.
+
+    Args:
+        ResultsSink (ResultsSink): Parent ResultsSink class.
+    """
+
+    def __init__(self, depth: int, directory: str = "logs",
+                 buffer_records: int = RESULTS_BUFFER_RECORDS):
+        """
+        Initialise the instance of the `AsyncResultsSink` class.
+
+        Args:
+            depth (int): Maximum number of chunks of lines queued for the \
+            writer thread.
+            directory (str, optional): Directory of the result files. \
+            Defaults to "logs".
+            buffer_records (int, optional): Number of lines of a file the \
+            writer buffers before writing them. Defaults to \
+            RESULTS_BUFFER_RECORDS.
+        """
+        super().__init__(directory, buffer_records)
+        self.pending: List[Tuple[str, Tuple[object, ...]]] = []
+        self.records: "Queue[object]" = Queue(maxsize=depth)
+        self.error: Optional[BaseException] = None
+        # Daemon, so that a run that exits without closing the sink does not
+        # wait on it forever; the atexit hook drains it first
+        self.writer: Optional[Thread] = Thread(
+            target=self._write_records, name="results-writer", daemon=True)
+        self.writer.start()
+
+    def _write_records(self) -> None:
+        try:
+            while True:
+                item = self.records.get()
+                if item is _END_OF_RESULTS:
+                    return
+                if isinstance(item, Event):
+                    ResultsSink.flush(self)
+                    item.set()
+                    continue
+                for file_name, fields in item:
+                    ResultsSink.write(self, file_name, *fields)
+        except BaseException as error:
+            # Raised on the simulation's thread by _put, flush or close
+            self.error = error
+
+    def _raise_error(self) -> None:
+        if self.error is not None:
+            raise self.error
+
+    def _put(self, item) -> None:
+        # Block on a full queue, but not on a writer that has failed
+        while True:
+            try:
+                self.records.put(item, timeout=PUT_TIMEOUT)
+                return
+            except Full:
+                self._raise_error()
+
+    def write(self, file_name: str, *fields: object) -> None:
+        """
+        Queue a line of comma separated fields for a result file.
+
+        The fields are formatted on the writer thread, so they must not be \
+        changed after they are passed.
+
+        Args:
+            file_name (str): Name of the file in the results directory, \
+            e.g. "tasks.txt".
+            *fields (object): Fields of the line, written with `str`.
+        """
+        pending = self.pending
+        pending.append((file_name, fields))
+        if len(pending) >= QUEUE_CHUNK_RECORDS:
+            self.pending = []
+            self._put(pending)
+
+    def _put_pending(self) -> None:
+        if self.pending:
+            pending, self.pending = self.pending, []
+            self._put(pending)
+
+    def flush(self) -> None:
+        """Wait for the writer to write every queued line."""
+        if self.writer is None:
+            ResultsSink.flush(self)
+            return
+        self._put_pending()
+        flushed = Event()
+        self._put(flushed)
+        while not flushed.wait(PUT_TIMEOUT):
+            self._raise_error()
+
+    def close(self) -> None:
+        """Write the queued lines, stop the writer and close the files."""
+        if self.writer is not None:
+            self._put_pending()
+            self._put(_END_OF_RESULTS)
+            self.writer.join()
+            self.writer = None
+            self._raise_error()
+        super().close()
@@ -31,6 +31,15 @@ class InconsistencyType(Enum):
 
 LM_HEARTBEAT_INTERVAL = 5
 NETWORK_DELAY = 0.0005  # Same as the Sparrow simulator
+# Number of (LM, partition, constraint signature) candidate node vectors each
+# GM keeps, least recently used first out
+CANDIDATE_CACHE_SIZE: Final[int] = 4096
+# Number of signature changes each GM's task queue logs for its per node
+# class heaps before it rebuilds them instead
+TASK_QUEUE_LOG_SIZE: Final[int] = 1 << 16
+# Number of lines of a result file buffered in memory before they are
+# written to it
+RESULTS_BUFFER_RECORDS: Final[int] = 8192
 
 TASK_FILE="task_stats_"+(os.path.basename(sys.argv[1])
                                       .split("_")[-1])+".csv"
@@ -56,3 +65,25 @@ class EstimationErrorDistribution:
     CONSTANT: Final[int] = 0
     RANDOM: Final[int] = 1
     MEAN: Final[int] = 2
+
+
+class EventPriority:
+    """
+    Named constants for ordering events that share a timestamp.
+
+    Events at the same simulation time are run in increasing order of their \
+    priority class, and in the order they were queued within a class. \
+    Resources released at a given instant are therefore seen by the requests \
+    and job arrivals at that same instant.
+    """
+
+    TASK_END: Final[int] = 0
+    TASK_RESPONSE: Final[int] = 1
+    LM_STATUS_UPDATE: Final[int] = 2
+    INCONSISTENCY: Final[int] = 3
+    BATCHED_INCONSISTENCY: Final[int] = 4
+    VERIFY_REQUEST: Final[int] = 5
+    VERIFY_REQUESTS: Final[int] = 6
+    LAUNCH_ON_NODE: Final[int] = 7
+    LM_REQUEST_UPDATE: Final[int] = 8
+    JOB_ARRIVAL: Final[int] = 9
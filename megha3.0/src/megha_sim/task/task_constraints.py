@@ -3,6 +3,8 @@ from __future__ import annotations
 from typing import Optional, TYPE_CHECKING
 import random
 
+from workload import mask_to_constraints
+
 if TYPE_CHECKING:
     from job import Job
 
@@ -23,7 +25,8 @@ class Task(object):
         object (object): This is the parent object class
     """
 
-    def __init__(self, task_id: str, job: Job, duration: int):
+    def __init__(self, task_id: str, job: Job, duration: int,
+                 constraints: Optional[int] = None):
         """
         Initialise the instance of the Task class.
 
@@ -31,6 +34,9 @@ class Task(object):
             task_id (str): The task identifier.
             job (Job): The instance of the Job to which the Task belongs.
             duration (int): Duration of the task.
+            constraints (Optional[int], optional): Bitmask of the placement \
+            constraints of the task, if they were drawn before the Task was \
+            created. Defaults to None, which draws them now.
         """
         
         self.task_id = task_id
@@ -43,31 +49,46 @@ class Task(object):
         self.scheduling_attempts=0
         self.communication_delay=0
         self.repartitions=0
-        self.constraints=self.assign_task_constraints()
-        self.no_match=set()
+        self.inconsistencies=0  # mappings found inconsistent by the LM
+        if constraints is None:
+            constraints=Task.draw_constraints(job.simulation)
+        self.constraints=constraints
         # Partition ID may differ from GM_id if repartitioning
         self.partition_id: None
         self.GM_id = None
         self.lm = None
         self.scheduled = False
-        with open("logs/task_constraints.txt", "a") as file:
-            file.write(str(self.start_time)+",")
-            file.write(self.job.job_id+","+self.task_id+",")
-            file.write(",".join(str(constraint) for constraint in self.constraints))
-            file.write("\n")
+        job.simulation.results.write(
+            "task_constraints.txt", self.start_time, self.job.job_id,
+            self.task_id, ",".join(str(constraint) for constraint in
+                                   mask_to_constraints(self.constraints)))
         
 
-    def assign_task_constraints(self):
-        constraints=[]
+    @staticmethod
+    def draw_constraints(simulation) -> int:
+        """
+        Draw the placement constraints of a new task.
+
+        The draws come from `Task.rand_obj`, so the constraints of a run only \
+        depend on the order in which they are drawn.
+
+        Args:
+            simulation (Simulation): The simulation holding the task type \
+            weights and the constraint frequencies.
+
+        Returns:
+            int: Bitmask of the constraints the task's node must satisfy, \
+            with bit j set for constraint j.
+        """
+        constraints=0
         task_type=Task.rand_obj.choices(["1","2","3","4"],k=1)[0]
-        weights=self.job.simulation.task_occurrence_type[task_type]
+        weights=simulation.task_occurrence_type[task_type]
         statistical_cluster=Task.rand_obj.choices(["1","2","3","4","5","6","7","8","9","10"],weights=weights,k=1)[0]
-        for j in range(0,len(self.job.simulation.tcfv[statistical_cluster])):
-            if(Task.rand_obj.random()*100<=self.job.simulation.tcfv[statistical_cluster][j]):
-                constraints.append(j)
-        # print(self.job.job_id,self.task_id,constraints)
+        for j in range(0,len(simulation.tcfv[statistical_cluster])):
+            if(Task.rand_obj.random()*100<=simulation.tcfv[statistical_cluster][j]):
+                constraints|=1<<j
         return constraints     
 
     def __str__(self):
-        return "job:"+str(self.job.job_id)+" task:"+str(self.task_id)+" constraints:"+str(self.constraints)
+        return "job:"+str(self.job.job_id)+" task:"+str(self.task_id)+" constraints:"+str(mask_to_constraints(self.constraints))
 
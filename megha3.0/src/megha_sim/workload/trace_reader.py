@@ -0,0 +1,113 @@
+"""
+This file contains the readers for the input trace files.
+
+Each line of a text trace describes one job, as whitespace separated values:
+the arrival time, the number of tasks, the estimated duration of the job and \
+the duration of each of its tasks. A trace reader turns the trace into a \
+sequence of `JobRecord`s that `Job` is built from.
+"""
+
+from typing import NamedTuple, Optional, Sequence
+
+
+class JobRecord(NamedTuple):
+    """
+    Description of a job as read from the input trace.
+
+    Args:
+        NamedTuple (NamedTuple): Typed version of collections.namedtuple().
+    """
+
+    start_time: float
+    num_tasks: int
+    estimated_duration: float
+    durations: Sequence[int]
+    # Placement constraint bitmask of each task, when drawn before the job is
+    # built
+    constraints: Optional[Sequence[int]] = None
+
+
+class TraceReader(object):
+    """
+    This is the abstract trace reader class.
+
+    A trace reader is an iterator over the `JobRecord`s of a trace, in the \
+    order of the trace file.
+
+    Args:
+        object (Object): Parent object class.
+    """
+
+    def __init__(self):
+        """
+        One cannot initialise the object of the abstract class `TraceReader`.
+
+        Raises:
+            NotImplementedError: This exception is raised when attempting to \
+            create an instance of the `TraceReader` class.
+        """
+        raise NotImplementedError(
+            "TraceReader is an abstract class and cannot be instantiated "
+            "directly")
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> JobRecord:
+        """
+        Return the record of the next job in the trace.
+
+        Raises:
+            NotImplementedError: This exception is raised when attempting to \
+            call `__next__` on an instance of the `TraceReader` class.
+        """
+        raise NotImplementedError(
+            "The __next__() method must be implemented by each class "
+            "subclassing TraceReader")
+
+    def close(self) -> None:
+        """Release the resources held by the reader."""
+
+
+class TextTraceReader(TraceReader):
+    """
+    Reader for the whitespace separated text traces (`*.tr`).
+
+    Args:
+        TraceReader (TraceReader): Parent TraceReader class.
+    """
+
+    def __init__(self, trace_file: str):
+        """
+        Initialise the instance of the `TextTraceReader` class.
+
+        Args:
+            trace_file (str): Path to the input trace file.
+        """
+        self.jobs_file = open(trace_file, "r")
+
+    def __next__(self) -> JobRecord:
+        line = self.jobs_file.readline()
+        if len(line) == 0:
+            raise StopIteration
+        return parse_job_line(line)
+
+    def close(self) -> None:
+        self.jobs_file.close()
+
+
+def parse_job_line(line: str) -> JobRecord:
+    """
+    Parse one line of a text trace.
+
+    Args:
+        line (str): Line from the input trace file.
+
+    Returns:
+        JobRecord: The job described by the line.
+    """
+    job_args = line.split()
+    # Same as eagle_simulation.py, the task durations are read as floating
+    # point values and then converted to an int
+    return JobRecord(float(job_args[0]), int(job_args[1]), float(job_args[2]),
+                     [int(float(duration)) for duration in job_args[3:]])
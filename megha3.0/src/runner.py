@@ -23,6 +23,32 @@ from megha_sim import (SimulationLogger,
 if __name__ == "__main__":
     WORKLOAD_FILE: Final[str] = sys.argv[1]
     CONFIG_FILE: Final[str] = sys.argv[2]
+    # Optional, selects the event queue backend: "heap" or "calendar"
+    EVENT_QUEUE_BACKEND: Final[str] = (sys.argv[3] if len(sys.argv) > 3
+                                       else "heap")
+    # Optional, number of jobs to read and prepare ahead of the simulation on
+    # a separate thread. 0 (default) prepares each job inline
+    PREFETCH_JOBS: Final[int] = (int(sys.argv[4]) if len(sys.argv) > 4
+                                 else 0)
+    # Optional, number of chunks of result lines queued for a writer thread
+    # that formats and writes them. 0 (default) writes them inline
+    RESULTS_QUEUE_DEPTH: Final[int] = (int(sys.argv[5]) if len(sys.argv) > 5
+                                       else 0)
+    # Optional, "text" (default) or "npz" to write the completed tasks and
+    # jobs as columns to logs/results.npz (needs NumPy), or "none"
+    RESULTS_FORMAT: Final[str] = (sys.argv[6] if len(sys.argv) > 6
+                                  else "text")
+    # Optional, 1 to print JRT and queueing delay statistics at the end of
+    # the run. 0 (default) does not keep them
+    STATISTICS: Final[bool] = (len(sys.argv) > 7 and bool(int(sys.argv[7])))
+    # Optional, selects how the GMs store the node vectors: "bitarray" or
+    # "packed" (needs NumPy)
+    CLUSTER_VIEW: Final[str] = (sys.argv[8] if len(sys.argv) > 8
+                                else "bitarray")
+    # Optional, "periodic" (default) LM heartbeats or "adaptive" ones, which
+    # are only sent by the LMs with changes to report
+    HEARTBEAT_MODE: Final[str] = (sys.argv[9] if len(sys.argv) > 9
+                                  else "periodic")
     with open("logs/task_constraints.txt", "w"):
         pass 
     with open("logs/node_constraints.txt", "w"):
@@ -50,7 +76,9 @@ if __name__ == "__main__":
     # This is not the simulation's virtual time. This is just to
     # understand how long the program takes
     t1 = time.time()
-    s = Simulation(WORKLOAD_FILE, CONFIG_FILE)
+    s = Simulation(WORKLOAD_FILE, CONFIG_FILE, EVENT_QUEUE_BACKEND,
+                   PREFETCH_JOBS, CLUSTER_VIEW, HEARTBEAT_MODE,
+                   RESULTS_QUEUE_DEPTH, RESULTS_FORMAT, STATISTICS)
     
     # print("Simulator Info , Simulation running")
     logger.metadata("Simulator Info , Simulation running")
@@ -84,8 +112,8 @@ if __name__ == "__main__":
     # logger.flush()
     for GM_id in s.gms:
         if s.gms[GM_id].task_queue:
-            for task_id in s.gms[GM_id].task_queue:
-                print(s.gms[GM_id].task_queue[task_id])
+            for task in s.gms[GM_id].task_queue:
+                print(task)
         # print("Tasks completed:",GM_id,s.gms[GM_id].tasks_remaining)
         # print("Tasks arrived:",GM_id,s.gms[GM_id].total_tasks)
         # print("Tasks deleted:",GM_id,s.gms[GM_id].deleted_tasks)
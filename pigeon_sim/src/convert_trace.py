@@ -0,0 +1,26 @@
+"""
+Program to convert a text trace into the binary trace format.
+
+The binary trace holds the same jobs as the text trace and can be passed to \
+`runner.py` in its place. It is loaded without parsing any text, so large \
+traces start up much faster.
+
+Usage:
+    python3 src/convert_trace.py <path to input trace> <path to binary trace>
+"""
+
+import sys
+import time
+from typing_extensions import Final
+
+from workload import convert_trace
+
+if __name__ == "__main__":
+    TEXT_TRACE_FILE: Final[str] = sys.argv[1]
+    BINARY_TRACE_FILE: Final[str] = sys.argv[2]
+
+    t1 = time.time()
+    num_jobs, num_tasks = convert_trace(TEXT_TRACE_FILE, BINARY_TRACE_FILE)
+    time_elapsed = time.time() - t1
+    print(f"Converted {num_jobs} jobs and {num_tasks} tasks from "
+          f"{TEXT_TRACE_FILE} to {BINARY_TRACE_FILE} in {time_elapsed} s")
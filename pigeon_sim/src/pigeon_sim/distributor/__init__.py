@@ -1,2 +1,4 @@
 
 from .distributor_constraints import Distributor
+from .feasibility import FeasibilityOracle, maximal_constraint_sets
+from .alias_table import AliasTable
@@ -0,0 +1,75 @@
+"""
+File containing the alias tables the Distributors pick Masters from.
+
+`random.choices` picks an item by a binary search of the running sums of \
+the weights. An alias table (Walker's alias method, with Vose's \
+construction) instead splits the weights into one column per item, each \
+column holding its own item up to a threshold and one other item, its \
+alias, above it. Picking an item is then one column lookup and one \
+comparison, however many items there are.
+
+The thresholds are kept as integers, in units of the total weight, so a \
+table built from integer weights picks every item with exactly its \
+probability.
+"""
+
+from typing import List, Sequence
+
+
+class AliasTable(object):
+	"""
+	Alias table of items with integer weights.
+
+	Args:
+		object (object): This is the parent object class
+	"""
+
+	def __init__(self, items: Sequence[str], weights: Sequence[int]):
+		"""
+		Initialise the instance of the AliasTable class.
+
+		Args:
+			items (Sequence[str]): The items, e.g. the master_ids.
+			weights (Sequence[int]): Weight of each item, at least one of \
+			them not 0.
+		"""
+		num_items = len(items)
+		self.items = list(items)
+		self.total = sum(weights)
+		# Weight of each column in units of total / num_items
+		scaled = [weight * num_items for weight in weights]
+		self.thresholds: List[int] = [self.total] * num_items
+		self.aliases: List[int] = list(range(num_items))
+		small = [index for index in range(num_items)
+				 if scaled[index] < self.total]
+		large = [index for index in range(num_items)
+				 if scaled[index] >= self.total]
+		while small and large:
+			less = small.pop()
+			more = large.pop()
+			self.thresholds[less] = scaled[less]
+			self.aliases[less] = more
+			# The column of `less` is filled up from `more`
+			scaled[more] -= self.total - scaled[less]
+			if scaled[more] < self.total:
+				small.append(more)
+			else:
+				large.append(more)
+		# Left over columns are full, which thresholds already says
+
+	def sample(self, random_value: float) -> str:
+		"""
+		Return the item picked by a random number.
+
+		Args:
+			random_value (float): Uniform random number in [0, 1), e.g. from \
+			`random.random`.
+
+		Returns:
+			str: The picked item.
+		"""
+		position = random_value * len(self.items)
+		column = min(int(position), len(self.items) - 1)
+		if (position - column) * self.total < self.thresholds[column]:
+			return self.items[column]
+		return self.items[self.aliases[column]]
@@ -11,6 +11,7 @@ import random
 from typing import List, Dict, TYPE_CHECKING
 from bitstring import BitArray
 from events import  TaskArrivedAtMasterEvent
+from .feasibility import FeasibilityOracle
 
 import simulator_utils.globals
 from simulator_utils import debug_print
@@ -42,7 +43,8 @@ class Distributor:
 	# Starting value for the seeds for the Random objects
 	SEED_VALUE = 13
 
-	def __init__(self, simulation, distributor_id: str, WORKERS_CONSTRAINT_SETS):
+	def __init__(self, simulation, distributor_id: str,
+				 feasibility_oracle: FeasibilityOracle):
 		self.distributor_id = distributor_id
 		self.simulation = simulation
 		self.RR_counter: int = 0
@@ -54,8 +56,9 @@ class Distributor:
 
 		# maintain per constraint demand per master
 
-		#initialize all worker constraints
-		self.WORKERS_CONSTRAINT_SETS=WORKERS_CONSTRAINT_SETS
+		#master weights of each constraint signature, shared with the other
+		#distributors
+		self.feasibility=feasibility_oracle
 		debug_print(f"Distributor {self.distributor_id} initialised")
 
 	def schedule_job(self,job,current_time):
@@ -65,19 +68,8 @@ class Distributor:
 		job.ideal_completion_time=0
 		for task in job.tasks:
 			# print("Job:",job.job_id,"Task:",task.task_id)
-			constraint_occurrence=dict()
-			constraints=set(task.constraints)
-			flag=False
-
-			for master_id in self.simulation.masters:
-				constraint_occurrence[master_id]=0
-				for constraint_set in self.WORKERS_CONSTRAINT_SETS[master_id]:
-					if set(task.constraints).issubset(constraint_set):
-						value=self.WORKERS_CONSTRAINT_SETS[master_id][constraint_set]
-						constraint_occurrence[master_id]+=value
-						if(value>0):
-							flag=True
-			if not flag:
+			cumulative_weights=self.feasibility.cumulative_weights(task.constraints)
+			if cumulative_weights is None:
 				# print(job.job_id,task.task_id,"NO WORKER SATISFYING CONSTRAINT")
 				job.num_tasks-=1
 				if(job.num_tasks==0):
@@ -85,30 +77,38 @@ class Distributor:
 			else:
 				if(task.duration>job.ideal_completion_time):
 					job.ideal_completion_time=task.duration
-				master_id=random.choices(list(constraint_occurrence.keys()),weights=list(constraint_occurrence.values()),k=1)[0]
-				if(constraint_occurrence[master_id]==0):
-					print("ERROR")
-					exit()
-			
+				# never a master with no worker satisfying the task
+				if self.simulation.MASTER_SELECTION=="alias":
+					master_id=self.feasibility.alias_table(task.constraints).sample(random.random())
+				else:
+					master_id=random.choices(self.feasibility.master_ids,cum_weights=cumulative_weights,k=1)[0]
+
 				task.master=self.simulation.masters[master_id]
 				task.distributor=self
 				# print(self.distributor_id,"Distributing:",task,"to",master_id)
-				self.simulation.event_queue.put((current_time+NETWORK_DELAY, TaskArrivedAtMasterEvent(self.simulation,task)))
+				self.simulation.event_queue.push(current_time+NETWORK_DELAY, TaskArrivedAtMasterEvent(self.simulation,task))
 				self.jobs_scheduled[job.job_id]=job
 
 	def task_completion(self,task,current_time):
 		# print(self.distributor_id,current_time,"TCD:",task,current_time-task.start_time-task.duration)
 		job=self.jobs_scheduled[task.job.job_id]
 		job.completed_tasks.append(task)
-		with open("logs/tasks.txt","a") as file:
-			file.write(job.job_id+","+task.task_id+","+str(task.start_time))
-			file.write(","+str(current_time)+"\n")
+		results_format=self.simulation.RESULTS_FORMAT
+		if results_format=="text":
+			self.simulation.results.write("tasks.txt",job.job_id,task.task_id,task.start_time,current_time)
+		elif results_format=="npz":
+			self.simulation.result_columns.add("tasks",job.job_id,task.task_id,task.start_time,task.scheduled_time,
+											   current_time,task.master.master_id,task.worker)
+		statistics=self.simulation.result_statistics
+		if statistics is not None:
+			statistics.add("queueing delay",job.is_high_priority,task.scheduled_time-task.start_time)
 		if len(job.completed_tasks)==job.num_tasks:#job completed
-			with open("logs/JRT.txt", "a") as file:
-				file.write(str(current_time)+",")
-				file.write(job.job_id+",")
-				file.write(str(current_time-job.start_time-job.ideal_completion_time))
-				file.write("\n")
+			if results_format=="text":
+				self.simulation.results.write("JRT.txt",current_time,job.job_id,current_time-job.start_time-job.ideal_completion_time)
+			elif results_format=="npz":
+				self.simulation.result_columns.add("jobs",current_time,job.job_id,current_time-job.start_time-job.ideal_completion_time)
+			if statistics is not None:
+				statistics.add("JRT",job.is_high_priority,current_time-job.start_time-job.ideal_completion_time)
 			print("JC",current_time,",",job.job_id,",",current_time-job.start_time-job.ideal_completion_time)
 			self.simulation.jobs_completed+=1
 		return
@@ -0,0 +1,125 @@
+"""
+File containing the feasibility oracle of the Distributors.
+
+A Distributor sends each task to a Master picked at random, weighted by the \
+number of workers of each Master whose constraint sets contain the task's \
+constraints, and drops the task when no worker has them. Working this out \
+meant testing the task against every constraint set of every Master. The \
+`FeasibilityOracle` remembers the result for every constraint signature it \
+has seen, so that after the first task of a signature the Master weights \
+are a dictionary lookup. A signature seen for the first time is tested \
+against the maximal constraint sets of the whole cluster first, those not a \
+subset of another set, so the Masters are only scanned for the signatures \
+some worker satisfies. With the "alias" master selection, the oracle also \
+keeps an `AliasTable` of the Masters per signature.
+"""
+
+from itertools import accumulate
+from typing import Dict, List, Optional
+
+from .alias_table import AliasTable
+
+
+def maximal_constraint_sets(constraint_sets: List[int]) -> List[int]:
+	"""
+	Return the constraint sets that are not a subset of another set.
+
+	Args:
+		constraint_sets (List[int]): Bitmasks of the constraint sets.
+
+	Returns:
+		List[int]: The distinct maximal sets, in the order they are first \
+		given.
+	"""
+	maximal_sets: List[int] = list()
+	for constraint_set in dict.fromkeys(constraint_sets):
+		if not any((constraint_set & ~other_set) == 0
+				   and constraint_set != other_set
+				   for other_set in constraint_sets):
+			maximal_sets.append(constraint_set)
+	return maximal_sets
+
+
+class FeasibilityOracle(object):
+	"""
+	Memoized Master weights of the tasks of each constraint signature.
+
+	Args:
+		object (object): This is the parent object class
+	"""
+
+	def __init__(self, cluster_model, master_ids: List[str]):
+		"""
+		Initialise the instance of the FeasibilityOracle class.
+
+		Args:
+			cluster_model (ClusterModel): The shared model of the cluster, \
+			with the constraint sets of each Master.
+			master_ids (List[str]): IDs of the Masters, in the order of the \
+			weights.
+		"""
+		self.master_ids = master_ids
+		self.constraint_sets = cluster_model.constraint_sets
+		self.maximal_sets = maximal_constraint_sets(
+			[constraint_set for master_id in master_ids
+			 for constraint_set in self.constraint_sets[master_id]])
+		# constraint signature -> cumulative Master weights, None if no
+		# worker satisfies it
+		self.weights: Dict[int, Optional[List[int]]] = dict()
+		# constraint signature -> alias table of the Masters, built the first
+		# time a task of the signature is sent with the "alias" selection
+		self.alias_tables: Dict[int, AliasTable] = dict()
+		self.hits = 0
+		self.misses = 0
+
+	def cumulative_weights(self, constraints: int) -> Optional[List[int]]:
+		"""
+		Return the cumulative weights of the Masters for a task.
+
+		The weight of a Master is the number of its workers counted in the \
+		constraint sets containing the constraints. The cumulative weights \
+		are passed to `random.choices` with `master_ids`.
+
+		Args:
+			constraints (int): Constraint bitmask of the task.
+
+		Returns:
+			Optional[List[int]]: The running sums of the weights, in the \
+			order of `master_ids`, or None if no worker satisfies the task.
+		"""
+		if constraints in self.weights:
+			self.hits += 1
+			return self.weights[constraints]
+		self.misses += 1
+		weights = None
+		if any((constraints & ~constraint_set) == 0
+			   for constraint_set in self.maximal_sets):
+			weights = list(accumulate(
+				sum(count for constraint_set, count
+					in self.constraint_sets[master_id].items()
+					if (constraints & ~constraint_set) == 0)
+				for master_id in self.master_ids))
+		self.weights[constraints] = weights
+		return weights
+
+	def alias_table(self, constraints: int) -> AliasTable:
+		"""
+		Return the alias table of the Masters for a task.
+
+		The Masters are weighted as in `cumulative_weights`, which must have \
+		returned weights for the constraints before.
+
+		Args:
+			constraints (int): Constraint bitmask of the task.
+
+		Returns:
+			AliasTable: Table picking the master_id of the task's Master.
+		"""
+		table = self.alias_tables.get(constraints)
+		if table is None:
+			cumulative_weights = self.weights[constraints]
+			table = self.alias_tables[constraints] = AliasTable(
+				self.master_ids,
+				[weight - previous for weight, previous
+				 in zip(cumulative_weights, [0] + cumulative_weights)])
+		return table
@@ -0,0 +1,160 @@
+"""
+This file contains the calendar queue backend of the simulator's event queue.
+
+Most events in the simulator are scheduled a fixed distance ahead of the \
+current time (`NETWORK_DELAY`, `LM_HEARTBEAT_INTERVAL`), so they land in a \
+small window of the near future. The calendar queue hashes events into \
+fixed-width time buckets ("days") and only orders a bucket once the \
+simulation reaches it, so an insert into a future bucket is a dictionary \
+lookup and a list append instead of an O(log n) heap push.
+"""
+
+from __future__ import annotations
+from heapq import heapify, heappop, heappush
+from itertools import count
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+from typing_extensions import Final
+
+from .heap_queue import EventEntry
+
+# Imports used only for type checking go here to avoid circular imports
+if TYPE_CHECKING:
+    from events import Event
+
+# Default span of simulation time covered by each bucket of the calendar
+BUCKET_WIDTH: Final[float] = 1.0
+
+
+class CalendarQueue(object):
+    """
+    Calendar queue holding the pending events of the simulation.
+
+    It has the same interface and ordering as `EventQueue`: entries are \
+    `(time, priority, sequence, event)` tuples and are returned in that \
+    order, so both backends produce identical runs.
+
+    Entries are kept in unordered per-day buckets, and a heap holds the \
+    index of every day that has a bucket. When the current day runs out, \
+    the next day is taken off that heap and its bucket is turned into a \
+    heap in one pass. Only entries pushed into the current day pay for a \
+    heap push, and that heap holds a single day's events.
+    """
+
+    def __init__(self, bucket_width: float = BUCKET_WIDTH):
+        """
+        Initialise an empty calendar queue.
+
+        Args:
+            bucket_width (float, optional): Span of simulation time covered \
+            by each bucket. Defaults to `BUCKET_WIDTH`.
+        """
+        self._bucket_width = bucket_width
+        self._buckets: Dict[int, List[EventEntry]] = {}
+        self._days: List[int] = []  # heap of days that have a bucket
+        self._current_day: Optional[int] = None
+        self._current: List[EventEntry] = []  # heap of the current day
+        self._sequence = count()
+        self._size = 0
+
+    def _add(self, entry: EventEntry) -> None:
+        day = int(entry[0] // self._bucket_width)
+        if day == self._current_day:
+            heappush(self._current, entry)
+            return
+        bucket = self._buckets.get(day)
+        if bucket is None:
+            self._buckets[day] = [entry]
+            heappush(self._days, day)
+        else:
+            bucket.append(entry)
+        if self._current_day is not None and day < self._current_day:
+            # Hand the rest of the current day back to the calendar so that
+            # the earlier day is picked up first.
+            if self._current:
+                self._buckets[self._current_day] = self._current
+                heappush(self._days, self._current_day)
+            self._current_day = None
+            self._current = []
+
+    def _next_day(self) -> None:
+        day = heappop(self._days)
+        bucket = self._buckets.pop(day)
+        heapify(bucket)
+        self._current_day = day
+        self._current = bucket
+
+    def push(self, time: float, event: Event) -> None:
+        """
+        Add an event to the queue.
+
+        Args:
+            time (float): The simulation time at which the event is to run.
+            event (Event): The event to run.
+        """
+        self._size += 1
+        entry = (time, event.PRIORITY, next(self._sequence), event)
+        # Fast path for a day that already has a bucket
+        bucket = self._buckets.get(int(time // self._bucket_width))
+        if bucket is not None:
+            bucket.append(entry)
+        else:
+            self._add(entry)
+
+    def push_all(self, timed_events: Iterable[Tuple[float, Event]]) -> None:
+        """
+        Add several `(time, event)` pairs to the queue.
+
+        Args:
+            timed_events (Iterable[Tuple[float, Event]]): The events to add \
+            along with the simulation time at which each is to run.
+        """
+        for time, event in timed_events:
+            self.push(time, event)
+
+    def pop(self) -> Tuple[float, Event]:
+        """
+        Remove and return the earliest event in the queue.
+
+        Returns:
+            Tuple[float, Event]: The time of the event and the event.
+        """
+        if not self._current:
+            self._next_day()
+        time, _, _, event = heappop(self._current)
+        self._size -= 1
+        return time, event
+
+    def pop_batch(self) -> Tuple[float, List[Event]]:
+        """
+        Remove and return every event that shares the earliest timestamp.
+
+        Returns:
+            Tuple[float, List[Event]]: The time of the events and the events, \
+            in the order `pop` would have returned them.
+        """
+        if not self._current:
+            self._next_day()
+        # Events with the same timestamp always fall on the same day
+        current = self._current
+        time, _, _, event = heappop(current)
+        events = [event]
+        while current and current[0][0] == time:
+            events.append(heappop(current)[3])
+        self._size -= len(events)
+        return time, events
+
+    def peek(self) -> Tuple[float, Event]:
+        """
+        Return the earliest event in the queue without removing it.
+
+        Returns:
+            Tuple[float, Event]: The time of the event and the event.
+        """
+        if not self._current:
+            self._next_day()
+        time, _, _, event = self._current[0]
+        return time, event
+
+    def __len__(self) -> int:
+        """Return the number of pending events."""
+        return self._size
@@ -9,13 +9,13 @@ Raises:
 """
 
 from __future__ import annotations
-from io import TextIOWrapper
 from typing import List, Optional, Tuple, TYPE_CHECKING
 import sys
 from job import Job
+from workload import JobRecord, TraceReader
 from task import Task
 # from simulation_logger import SimulationLogger
-from simulator_utils.values import ( NETWORK_DELAY,
+from simulator_utils.values import ( NETWORK_DELAY, EventPriority,
                                     TaskDurationDistributions)
 import os
 import sys
@@ -38,10 +38,16 @@ class Event(object):
     """
     This is the abstract `Event` object class.
 
+    Every subclass sets `PRIORITY` to its `EventPriority` class, which decides \
+    the order in which events sharing a timestamp are run. The simulation \
+    hands all events of one type at a timestamp to `run_batch` together.
+
     Args:
         object (Object): Parent object class.
     """
 
+    PRIORITY: int
+
     def __init__(self):
         """
         One cannot initialise the object of the abstract class `Event`.
@@ -56,19 +62,6 @@ class Event(object):
         raise NotImplementedError(
             "Event is an abstract class and cannot be instantiated directly")
 
-    def __lt__(self, other: Event) -> bool:
-        """
-        Compare the `Event` object with another object of `Event` class.
-
-        Args:
-            other (Event): The object to compare with.
-
-        Returns:
-            bool: The Event object is always lesser than the object it is \
-            compared with.
-        """
-        return True
-
     def run(self, current_time: float):
         """
         Run the actions to handle the `Event`.
@@ -85,6 +78,30 @@ class Event(object):
             "The run() method must be implemented by each class subclassing "
             "Event")
 
+    @classmethod
+    def run_batch(cls, events: List[Event], current_time: float):
+        """
+        Run the actions to handle a batch of events of this type.
+
+        All the events in the batch share `current_time` and are in the order \
+        they were taken off the event queue. By default, each event is run in \
+        turn. Subclasses override this to handle the whole batch in one pass.
+
+        Args:
+            events (List[Event]): The events of this type to run.
+            current_time (float): The current time in the simulation.
+
+        Returns:
+            List[Tuple[float, Event]]: Any events that should be added to the \
+            queue.
+        """
+        new_events: List[Tuple[float, Event]] = []
+        for event in events:
+            event_new_events = event.run(current_time)
+            if event_new_events:
+                new_events.extend(event_new_events)
+        return new_events
+
 
 ##########################################################################
 ##########################################################################
@@ -100,6 +117,8 @@ class TaskEndEvent(Event):
             Event (Event): Parent Event class.
     """
 
+    PRIORITY: int = EventPriority.TASK_END
+
     def __init__(self,simulation, task: Task):
         """
         Initialise the instance of the `TaskEndEvent` class.
@@ -111,19 +130,6 @@ class TaskEndEvent(Event):
         self.task: Task = task
         self.simulation=simulation
 
-    def __lt__(self, other: Event) -> bool:
-        """
-        Compare the `TaskEndEvent` object with another object of Event class.
-
-        Args:
-                other (Event): The object to compare with.
-
-        Returns:
-                bool: The `TaskEndEvent` object is always lesser than the \
-                object it is compared with.
-        """
-        return True
-
     def run(self, current_time: float):
         """
         Run the actions to perform on the event of task completion.
@@ -150,13 +156,33 @@ class TaskArrivedAtWorkerEvent(Event):
     Event created after master sends task to worker
     """
 
+    PRIORITY: int = EventPriority.TASK_ARRIVED_AT_WORKER
+
     def __init__(self,simulation,task):
         self.simulation=simulation
         self.task=task
 
     def run(self,current_time):
         # print(current_time,"TaskArrivedAtWorkerEvent, ",self.task.job.job_id,"/", self.task.task_id)
-        self.simulation.event_queue.put((current_time+self.task.duration+NETWORK_DELAY,TaskEndEvent(self.simulation,self.task)))
+        self.task.scheduled_time = current_time  # launch time
+        self.simulation.event_queue.push(current_time+self.task.duration+NETWORK_DELAY,TaskEndEvent(self.simulation,self.task))
+
+    @classmethod
+    def run_batch(cls, events: List[TaskArrivedAtWorkerEvent],
+                  current_time: float):
+        """
+        Start every task that reached its worker at `current_time`.
+
+        Args:
+            events (List[TaskArrivedAtWorkerEvent]): The events of the tasks \
+            that reached their workers.
+            current_time (float): The current time in the simulation.
+        """
+        for event in events:
+            event.task.scheduled_time = current_time  # launch time
+        return [(current_time+event.task.duration+NETWORK_DELAY,
+                 TaskEndEvent(event.simulation, event.task))
+                for event in events]
 
 ##########################################################################
 ##########################################################################
@@ -166,6 +192,8 @@ class TaskArrivedAtMasterEvent(Event):
     Event created after distributor sends task to master
     """
 
+    PRIORITY: int = EventPriority.TASK_ARRIVED_AT_MASTER
+
     def __init__(self,simulation,task):
         self.simulation=simulation
         self.task=task
@@ -183,13 +211,14 @@ class JobArrivalEvent(Event):
         Event (Event): Parent `Event` class.
     """
 
+    PRIORITY: int = EventPriority.JOB_ARRIVAL
     distributor_counter: int = 0
 
 
     def __init__(self, simulation: Simulation,
                  task_distribution: TaskDurationDistributions,
-                 job: Job,
-                 jobs_file: TextIOWrapper):
+                 job_record: JobRecord,
+                 trace_reader: TraceReader):
         """
         Initialise the instance of the `JobArrivalEvent` class.
 
@@ -198,26 +227,16 @@ class JobArrivalEvent(Event):
             into.
             task_distribution (TaskDurationDistributions): Select the \
             distribution of the duration/run-time of the tasks of the Job
-            job (Job): The Job object that has arrived into the user queue.
-            jobs_file (TextIOWrapper): File handle to the input trace file.
+            job_record (JobRecord): The job that arrives into the user \
+            queue, as read from the trace. Its `Job` and `Task` objects are \
+            only built when the event runs.
+            trace_reader (TraceReader): Reader over the jobs of the input \
+            trace file.
         """
         self.simulation = simulation
         self.task_distribution = task_distribution
-        self.job = job
-        self.jobs_file = jobs_file  # Jobs file (input trace file) handler
-
-    # def __lt__(self, other: Event) -> bool:
-    #     """
-    #     Compare the `JobArrivalEvent` object with another object of Event class.
-
-    #     Args:
-    #         other (Event): The object to compare with.
-
-    #     Returns:
-    #         bool: The `JobArrivalEvent` object is always lesser than the object \
-    #               it is compared with.
-    #     """
-    #     return True
+        self.job_record = job_record
+        self.trace_reader = trace_reader  # Input trace file reader
 
     def run(self, current_time: float):
         """
@@ -228,21 +247,22 @@ class JobArrivalEvent(Event):
         """
         # Log the JobArrivalEvent
         # logger.info(f"{current_time} , JobArrivalEvent , {self.task_distribution}")
-        # print(current_time, ",", "JobArrivalEvent",",", self.job.job_id)
+        # print(current_time, ",", "JobArrivalEvent",",", self.job_record.start_time)
 
         #assign job to a distributor at random
 
         self.assigned_Distributor=self.simulation.distributors[str(self.simulation.rand_obj.randint(1,self.simulation.NUM_distributors))]
-        self.assigned_Distributor.schedule_job(self.job,current_time)
+        # The job and its tasks are only built now that it is dispatched
+        job = Job(self.task_distribution, self.job_record, self.simulation)
+        self.assigned_Distributor.schedule_job(job,current_time)
         
-        # Creating a new Job Arrival event for the next job in the trace
-        line = self.jobs_file.readline()
-        if len(line) == 0:
+        # Reusing this event for the next job in the trace
+        job_record = next(self.trace_reader, None)
+        if job_record is None:
+            self.job_record = None
             self.simulation.scheduled_last_job = True
         else:
-            self.job = Job(self.task_distribution, line, self.simulation)
-            self.simulation.event_queue.put(
-                    (self.job.start_time,
-                     self))
+            self.job_record = job_record
+            self.simulation.event_queue.push(self.job_record.start_time, self)
             self.simulation.jobs_scheduled += 1
     
\ No newline at end of file
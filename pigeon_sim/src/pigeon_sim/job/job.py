@@ -11,6 +11,7 @@ from typing import Dict, List, Optional, TYPE_CHECKING
 from typing_extensions import Final
 
 from task import Task
+from workload import JobRecord
 from simulator_utils.values import TaskDurationDistributions
 from simulator_utils.values import (Master_HEARTBEAT_INTERVAL, NETWORK_DELAY,
                                     InconsistencyType,
@@ -25,26 +26,51 @@ class Job(object):
     job_count = 1  # To assign IDs
     job_start_tstamps: Dict[float, float] = {}
 
-    def __init__(self, task_distribution: TaskDurationDistributions, line: str,
-                 simulation):
+    @classmethod
+    def dephase(cls, job_record: JobRecord) -> JobRecord:
         """
         Retaining below logic as-is to compare with Sparrow.
 
-        During initialisation of the object, we dephase the incoming job in
-        case it has the exact submission time as another already submitted job
+        We dephase the incoming job in case it has the exact submission time
+        as another already submitted job. This is done as the job is read from
+        the trace, so that its arrival event is queued at the shifted time.
+
+        Args:
+            job_record (JobRecord): The job as read from the input trace file.
+
+        Returns:
+            JobRecord: The job with its start time shifted if needed.
+        """
+        start_time = job_record.start_time
+        # IF the job's start_time has never been seen before
+        if start_time not in cls.job_start_tstamps:
+            # Add it to the dict of start time stamps
+            cls.job_start_tstamps[start_time] = start_time
+            return job_record
+        # If the job's start_time has been seen before
+        # Shift the start time of the jobs with this duplicate start time by 0.01s forward to prevent
+        # a clash
+        cls.job_start_tstamps[start_time] += 0.01
+        # Assign this shifted time stamp to the job start time
+        return job_record._replace(start_time=cls.job_start_tstamps[start_time])
+
+    def __init__(self, task_distribution: TaskDurationDistributions,
+                 job_record: JobRecord, simulation):
+        """
+        Initialise the instance of the Job class.
 
         Args:
             task_distribution (TaskDurationDistributions): In case we need to
             explore other task distribution methods. This is retained from the
             Sparrow code as-is.
-            line (str): Line from the input trace file
+            job_record (JobRecord): The job as read from the input trace \
+            file, already passed through `dephase`.
             simulation (Simulation): The object of the simulation class. This
             is not currently begin used in the class's internal implementation.
         """
 
-        job_args: List[str] = line.strip().split()
-        self.start_time: float = float(job_args[0])
-        self.num_tasks: int = int(job_args[1])
+        self.start_time: float = job_record.start_time
+        self.num_tasks: int = job_record.num_tasks
         self.simulation = simulation
         self.tasks: List = []
         self.task_counter = 0
@@ -52,23 +78,11 @@ class Job(object):
         self.distributor: Optional[Distributor] = None
         self.completion_time: float = -1.
         self.is_high_priority=False
-        if float(job_args[2])<self.simulation.cutoff:
+        if job_record.estimated_duration<self.simulation.cutoff:
             # print("HP")
             self.is_high_priority=True
         # self.stat_file=open(TASK_FILE,"a")
-        self.vals = [int(float(i)) for i in job_args[3:]]
-        self.ideal_completion_time: Final = max(self.vals)
-
-        # IF the job's start_time has never been seen before
-        if self.start_time not in self.job_start_tstamps:
-            # Add it to the dict of start time stamps
-            self.job_start_tstamps[self.start_time] = self.start_time
-        else:  # If the job's start_time has been seen before
-            # Shift the start time of the jobs with this duplicate start time by 0.01s forward to prevent
-            # a clash
-            self.job_start_tstamps[self.start_time] += 0.01
-            # Assign this shifted time stamp to the job start time
-            self.start_time = self.job_start_tstamps[self.start_time]
+        self.ideal_completion_time: Final = max(job_record.durations)
 
         self.job_id = str(Job.job_count)
         Job.job_count += 1
@@ -77,16 +91,17 @@ class Job(object):
 
         # in case we need to explore other distr- retaining Sparrow code as-is
         if task_distribution == TaskDurationDistributions.FROM_FILE:
-            self.file_task_execution_time(job_args)
+            self.file_task_execution_time(job_record.durations,
+                                          job_record.constraints)
 
     
     # Job class - parse file line
 
-    def file_task_execution_time(self, job_args):
+    def file_task_execution_time(self, durations, constraints=None):
         # Adding each of the tasks to the dict
-        for task_duration in (job_args[3:]):
-            # Same as eagle_simulation.py, This is done to read the floating
-            # point value from the string and then convert it to an int
-            duration = int(float(task_duration))
-            self.tasks.append(Task(str(self.task_counter), self, duration))
+        if constraints is None:
+            constraints = [None] * len(durations)
+        for duration, task_constraints in zip(durations, constraints):
+            self.tasks.append(Task(str(self.task_counter), self, duration,
+                                   task_constraints))
             self.task_counter += 1
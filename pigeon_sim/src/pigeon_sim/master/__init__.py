@@ -1 +1,3 @@
 from .master_constraints import Master
+from .cluster_model import ClusterModel, compile_cluster_model
+from .task_queue import TaskQueue
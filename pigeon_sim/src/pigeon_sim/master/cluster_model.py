@@ -0,0 +1,95 @@
+"""
+File containing the compiled cluster model of the Masters.
+
+The cluster configuration gives, for the workers of every Master, one "0b" \
+string per constraint with the character of each worker set when the worker \
+has the constraint. `compile_cluster_model` parses the strings once into a \
+`ClusterModel` holding the constraint vectors, the constraint bitmask of \
+each worker and the constraint sets of each Master. The Simulation, the \
+Distributors and the Masters all share this one model and never change it, \
+so no component keeps a copy of the config.
+"""
+
+from typing import Dict, List
+
+from bitstring import Bits
+
+from workload import constraints_to_mask
+
+
+class ClusterModel(object):
+	"""
+	Constraint vectors, worker bitmasks and constraint sets of a cluster.
+
+	The model is shared by the Distributors and the Masters and must not be \
+	changed; the vectors are immutable `Bits` for that reason.
+
+	Args:
+		object (object): This is the parent object class
+	"""
+
+	def __init__(self, num_master_workers: int,
+				 vectors: Dict[str, List[Bits]],
+				 worker_masks: Dict[str, List[int]],
+				 constraint_sets: Dict[str, Dict[int, int]]):
+		"""
+		Initialise the instance of the ClusterModel class.
+
+		Args:
+			num_master_workers (int): Number of workers of each Master.
+			vectors (Dict[str, List[Bits]]): Constraint vectors of the \
+			workers of each Master, by master_id.
+			worker_masks (Dict[str, List[int]]): Constraint bitmask of each \
+			worker, indexed as [master_id][worker_id].
+			constraint_sets (Dict[str, Dict[int, int]]): Number of workers \
+			of each Master having each of its constraint sets, by bitmask.
+		"""
+		self.num_master_workers = num_master_workers
+		self.master_ids = list(vectors)
+		self.vectors = vectors
+		self.worker_masks = worker_masks
+		# Number of constraints of each worker, [master_id][worker_id]
+		self.worker_constraint_counts = {
+			master_id: [bin(mask).count("1") for mask in masks]
+			for master_id, masks in worker_masks.items()}
+		self.constraint_sets = constraint_sets
+
+
+def compile_cluster_model(config) -> ClusterModel:
+	"""
+	Parse the constraint vectors of a cluster configuration.
+
+	Args:
+		config (dict): The cluster configuration, with the constraint \
+		vectors of the workers of each Master as "0b" strings.
+
+	Returns:
+		ClusterModel: The compiled model.
+	"""
+	num_master_workers = (int(config["num_workers"])
+						  // int(config["num_masters"]))
+	vectors: Dict[str, List[Bits]] = dict()
+	worker_masks: Dict[str, List[int]] = dict()
+	constraint_sets: Dict[str, Dict[int, int]] = dict()
+	for master_id, constraint_vectors in config["workers"].items():
+		vectors[master_id] = [Bits(constraint_vector)
+							  for constraint_vector in constraint_vectors]
+		masks = list()
+		master_sets: Dict[int, int] = dict()
+		for worker_id in range(0, num_master_workers):
+			worker_mask = constraints_to_mask(
+				constraint for constraint, constraint_vector
+				in enumerate(vectors[master_id]) if constraint_vector[worker_id])
+			masks.append(worker_mask)
+			# Count the worker in every set it is a subset of, or add its set
+			flag = False
+			for key in master_sets.keys():
+				if (worker_mask & ~key) == 0:
+					master_sets[key] += 1
+					flag = True
+			if not flag:
+				master_sets[worker_mask] = 1
+		worker_masks[master_id] = masks
+		constraint_sets[master_id] = master_sets
+	return ClusterModel(num_master_workers, vectors, worker_masks,
+						constraint_sets)
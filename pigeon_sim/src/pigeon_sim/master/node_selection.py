@@ -0,0 +1,60 @@
+"""
+File containing the worker selection of the Master.
+
+`Master.schedule_task` builds a vector of the free workers that satisfy a \
+task. Rather than listing every set bit of that vector and looping over the \
+list, the `WorkerSelector` picks the worker straight from the vector. The \
+workers of the Master are grouped into one vector per number of constraints, \
+and the first set bit of the match vector ANDed with each group's vector is \
+searched, from the group with the fewest constraints up. This returns the \
+lowest indexed of the workers with the fewest constraints.
+"""
+
+from typing import List, Optional
+
+from bitstring import BitArray
+
+
+class WorkerSelector(object):
+	"""
+	Selects the worker a task is sent to among the workers matching it.
+
+	Args:
+		object (object): This is the parent object class
+	"""
+
+	def __init__(self, worker_constraint_counts: List[int]):
+		"""
+		Initialise the instance of the WorkerSelector class.
+
+		Args:
+			worker_constraint_counts (List[int]): Number of constraints of \
+			each worker of the Master.
+		"""
+		# One vector per number of constraints, with the bits of the workers
+		# having that many constraints set, fewest first
+		self.count_vectors: List[BitArray] = list()
+		for count in sorted(set(worker_constraint_counts)):
+			count_vector = BitArray("0b"+"0"*len(worker_constraint_counts))
+			count_vector.set(True, [worker for worker, worker_count
+									in enumerate(worker_constraint_counts)
+									if worker_count == count])
+			self.count_vectors.append(count_vector)
+
+	def fewest_constraints(self, match_vector: BitArray) -> Optional[int]:
+		"""
+		Return the lowest indexed matching worker with the fewest constraints.
+
+		Args:
+			match_vector (BitArray): Vector of the matching workers.
+
+		Returns:
+			Optional[int]: The worker, or None if no worker matches.
+		"""
+		for count_vector in self.count_vectors:
+			# findall rather than find, whose result differs between bitstring
+			# versions
+			position = next((match_vector & count_vector).findall("0b1"), None)
+			if position is not None:
+				return position
+		return None
@@ -1,16 +1,20 @@
-import pickle
-import queue
 import json
+from itertools import groupby
 from typing import Dict
 import random
 
-from bitstring import BitArray
-from master import Master
-from distributor import Distributor
+from master import Master, compile_cluster_model
+from distributor import Distributor, FeasibilityOracle
 from job import Job
+from task import Task
+from workload import (ConstraintStream, JobRecord, PrefetchTraceReader,
+                      constraint_cache_file, mask_to_constraints, open_trace)
 # from simulation_logger import SimulationLogger
+from simulation_logger import (AsyncResultsSink, ResultColumns, ResultsSink,
+                               ResultStatistics)
 from simulator_utils.values import TaskDurationDistributions
 from events import JobArrivalEvent
+from event_core import EVENT_QUEUE_BACKENDS
 from simulator_utils import debug_print
 
 import os
@@ -23,51 +27,91 @@ WORKLOAD_FILE_NAME = "subtrace_"+(os.path.basename(WORKLOAD_FILE)
 
 # logger = SimulationLogger(__name__,WORKLOAD_FILE_NAME).get_logger()
 
+# Columns of the tables of the columnar results, see ResultColumns
+RESULT_TABLES = {
+    "tasks": (("job_id", "U"), ("task_id", "U"), ("arrival", "d"),
+              ("launch", "d"), ("end", "d"), ("master", "U"), ("worker", "q")),
+    "jobs": (("end", "d"), ("job_id", "U"), ("JRT", "d")),
+}
+
+# Values of the results_format argument
+RESULTS_FORMATS = ("text", "npz", "none")
+
+# Values of the master_selection argument
+MASTER_SELECTIONS = ("choices", "alias")
+
 
 class Simulation(object):
     def __init__(
             self,
             workload,
-            config
+            config,
+            event_queue_backend="heap",
+            prefetch_jobs=0,
+            results_queue_depth=0,
+            results_format="text",
+            statistics=False,
+            master_selection="choices"
            ):
 
         
         self.config = json.load(open(config))
         self.WORKLOAD_FILE = workload
+        self.PREFETCH_JOBS = prefetch_jobs  # 0 prepares the jobs inline
         self.NUM_masters=int(self.config["num_masters"])
         self.NUM_distributors=int(self.config["num_distributors"])
         self.total_workers = int(self.config["num_workers"])
         self.cutoff=float(self.config["cutoff"])
+        # "choices": the Distributors pick a task's Master with random.choices
+        # over the Masters' weights. "alias": from an alias table of the
+        # weights, built once per constraint signature. Both pick the Masters
+        # with the same probabilities, but not the same Masters
+        if master_selection not in MASTER_SELECTIONS:
+            raise ValueError(f"Unknown master selection {master_selection!r}, "
+                             f"expected one of {MASTER_SELECTIONS}")
+        self.MASTER_SELECTION = master_selection
         self.jobs = {}
-        self.event_queue = queue.PriorityQueue()
+        self.event_queue = EVENT_QUEUE_BACKENDS[event_queue_backend]()
+        # lines of the files in logs/, formatted and written on a writer
+        # thread if results_queue_depth is not 0
+        self.results = (AsyncResultsSink(results_queue_depth)
+                        if results_queue_depth > 0 else ResultsSink())
+        # "text": the completed tasks and jobs are written to tasks.txt and
+        # JRT.txt. "npz": they are kept in typed columns and written to
+        # logs/results.npz at the end of the run. "none": they are not kept
+        if results_format not in RESULTS_FORMATS:
+            raise ValueError(f"Unknown results format {results_format!r}, "
+                             f"expected one of {RESULTS_FORMATS}")
+        self.RESULTS_FORMAT = results_format
+        self.result_columns = (ResultColumns("logs/results.npz",
+                                             RESULT_TABLES)
+                               if results_format == "npz" else None)
+        # JRT and queueing delay statistics, printed at the end of the run
+        self.result_statistics = ResultStatistics() if statistics else None
         self.rand_obj=random.Random()
         self.distributors = {}
         self.workers=dict()
         self.task_occurrence_type={} #weights for generating task placement constraints
         counter = 1
-        WORKERS_CONSTRAINT_SETS=dict()
-        for master_id in self.config["workers"]:
-            WORKERS_CONSTRAINT_SETS[master_id]=dict()
-            for worker_id in range(0,int(self.config["num_workers"])//int(self.config["num_masters"])):
-                worker_constraints=set()
-                for constraint,constraint_vector in enumerate(self.config["workers"][master_id]):
-                    if BitArray(constraint_vector)[worker_id]:
-                        worker_constraints.add(constraint)
-                with open("logs/node_constraints.txt", "a") as file:    
-                        key=master_id+"_"+str(worker_id)
-                        file.write(key+",")
-                        file.write(",".join(str(constraint) for constraint in worker_constraints ))
-                        file.write("\n")
-                flag=False
-                for key in WORKERS_CONSTRAINT_SETS[master_id].keys():
-                    if set(worker_constraints).issubset(key):
-                    # If the set is a subset of the key, increment the corresponding value
-                        WORKERS_CONSTRAINT_SETS[master_id][key] += 1
-                        flag=True
-                if not flag:
-                    WORKERS_CONSTRAINT_SETS[master_id][tuple(worker_constraints)]=1
+        # Constraint vectors, worker bitmasks and constraint sets of the
+        # cluster, shared by the Distributors and Masters
+        self.cluster_model = compile_cluster_model(self.config)
+        for master_id in self.cluster_model.master_ids:
+            for worker_id, worker_mask in enumerate(
+                    self.cluster_model.worker_masks[master_id]):
+                self.results.write("node_constraints.txt",
+                                   master_id+"_"+str(worker_id),
+                                   ",".join(str(constraint) for constraint
+                                            in mask_to_constraints(
+                                                worker_mask)))
+        # Master weights of the tasks, memoized per constraint signature, for
+        # the Masters created below
+        self.feasibility_oracle = FeasibilityOracle(
+            self.cluster_model,
+            [str(master) for master in range(1, self.NUM_masters + 1)])
         while len(self.distributors) < self.NUM_distributors:
-            self.distributors[str(counter)] = Distributor(self, str(counter), WORKERS_CONSTRAINT_SETS)  # create deep copy
+            self.distributors[str(counter)] = Distributor(
+                self, str(counter), self.feasibility_oracle)
             counter += 1
 
         # initialise masters
@@ -75,10 +119,8 @@ class Simulation(object):
         counter = 1
 
         while len(self.masters) < self.NUM_masters:
-            self.masters[str(counter)] = Master(self,
-                                        str(counter),
-                                        pickle.loads(
-                                            pickle.dumps(self.config)))  # create deep copy
+            self.masters[str(counter)] = Master(self, str(counter),
+                                                self.cluster_model)
 
             # debug_print(f"Master - {counter} "
             #             f"{self.masters[str(counter)].get_free_cpu_count_per_distributor()}")
@@ -150,32 +192,68 @@ class Simulation(object):
             for j in ["1","2","3","4","5","6","7","8","9","10"]:
                 self.task_occurrence_type[i].append(task_occurrence[j][i])
 
+        # Task placement constraints, cached next to the trace for later runs
+        self.constraint_stream = ConstraintStream(
+            self.task_occurrence_type, self.tcfv, Task.seed_value,
+            constraint_cache_file(self.WORKLOAD_FILE))
+
         print("Simulation instantiated")
 
                 
  # Simulation class
+    def prepare_job_record(self, job_record: JobRecord) -> JobRecord:
+        """
+        Do the work on a job that does not depend on the simulation state.
+
+        This dephases the start time of the job and takes the placement \
+        constraints of its tasks from the constraint stream. It is called \
+        once per job, in trace order, possibly from the trace prefetch thread.
+
+        Args:
+            job_record (JobRecord): The job as read from the input trace file.
+
+        Returns:
+            JobRecord: The job, ready to be built when it arrives.
+        """
+        job_record = Job.dephase(job_record)
+        return job_record._replace(constraints=self.constraint_stream.draw(
+            len(job_record.durations)))
+
     def run(self):
         last_time = 0
     
-        self.jobs_file = open(self.WORKLOAD_FILE, 'r')
+        self.trace_reader = PrefetchTraceReader(
+            open_trace(self.WORKLOAD_FILE), self.prepare_job_record,
+            self.PREFETCH_JOBS)
 
         self.task_distribution = TaskDurationDistributions.FROM_FILE
 
-        line = self.jobs_file.readline()  # first job
-        new_job = Job(self.task_distribution, line, self)
-        self.event_queue.put((float(line.split()[0]), JobArrivalEvent(
-            self, self.task_distribution, new_job, self.jobs_file)))
+        job_record = next(self.trace_reader)  # first job
+        self.event_queue.push(job_record.start_time, JobArrivalEvent(
+            self, self.task_distribution, job_record, self.trace_reader))
         
         self.jobs_scheduled = 1
 
-        # start processing events
-        while (not self.event_queue.empty()):
-            current_time, event = self.event_queue.get()
+        # start processing events, one batch per timestamp. Each event type
+        # in the batch is handed to its `run_batch` handler in one call.
+        while self.event_queue:
+            current_time, batch = self.event_queue.pop_batch()
             assert current_time >= last_time
             last_time = current_time
-            event.run(current_time)
+            for event_type, events in groupby(batch, key=type):
+                new_events = event_type.run_batch(list(events), current_time)
+                if new_events:
+                    self.event_queue.push_all(new_events)
         print("Simulation ending, no more events")
         for master_id in self.masters:
             print(len(self.masters[master_id].high_priority_task_queue),len(self.masters[master_id].low_priority_task_queue))
         # logger.info("Simulator Info , Simulation ending, no more events")
-        self.jobs_file.close()
+        self.trace_reader.close()
+        self.constraint_stream.close()
+        self.results.close()
+        if self.result_columns is not None:
+            self.result_columns.close()
+        if self.result_statistics is not None:
+            print(self.result_statistics.summary())
+            print("Feasibility checks memoized:", self.feasibility_oracle.hits,
+                  "computed:", self.feasibility_oracle.misses)
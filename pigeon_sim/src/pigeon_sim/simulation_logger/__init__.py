@@ -1,3 +1,6 @@
 # from .logger import SimulationLogger
 from .msg_list import (MATCHING_LOGIC_MSG, CLUSTER_SATURATED_MSG,
                        MATCHING_LOGIC_REPARTITION_MSG)
+from .results_sink import AsyncResultsSink, ResultsSink
+from .result_columns import ResultColumns, load_results
+from .result_statistics import QuantileSketch, ResultStatistics
@@ -0,0 +1,113 @@
+"""
+Columnar binary output of the results of a simulation.
+
+Rather than formatting every completed task and job as a line of text, \
+`ResultColumns` appends the fields of each row to typed column buffers, and \
+writes all the columns to a NumPy `.npz` archive when it is closed. The \
+archive is read back with `load_results`, without parsing any text, e.g. \
+into a pandas DataFrame with `pandas.DataFrame(load_results(path)["tasks"])`.
+
+Archive layout: one array per column, named `<table>.<column>`, in the \
+order of the columns of each table. Columns of type "U" hold strings, and \
+the others hold the `array` type code of their values ("d" for floats and \
+"q" for integers).
+"""
+
+from array import array
+import atexit
+import os
+from typing import Dict, List, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only the columnar output needs it
+    np = None
+
+# Type code of the columns holding strings, such as the job and task IDs
+STRING_COLUMN = "U"
+
+
+class ResultColumns(object):
+    """
+    Typed column buffers of the result tables of a simulation.
+
+    Args:
+        object (object): This is the parent object class
+    """
+
+    def __init__(self, file_path: str,
+                 tables: Dict[str, Sequence[Tuple[str, str]]]):
+        """
+        Initialise the instance of the `ResultColumns` class.
+
+        Args:
+            file_path (str): Path of the `.npz` archive to write.
+            tables (Dict[str, Sequence[Tuple[str, str]]]): Name and type \
+            code of the columns of each table, in order.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("the columnar results need NumPy")
+        self.file_path = file_path
+        self.columns: Dict[str, List[Tuple[str, Union[list, array]]]] = dict()
+        # Bound append methods of the columns of each table, in order
+        self.appends = dict()
+        for table, table_columns in tables.items():
+            self.columns[table] = [
+                (name, [] if type_code == STRING_COLUMN else array(type_code))
+                for name, type_code in table_columns]
+            self.appends[table] = [column.append for _, column
+                                   in self.columns[table]]
+        self.closed = False
+        atexit.register(self.close)
+
+    def add(self, table: str, *values) -> None:
+        """
+        Add a row to a table.
+
+        Args:
+            table (str): Name of the table.
+            *values: Value of each column of the row, in order.
+        """
+        for append, value in zip(self.appends[table], values):
+            append(value)
+
+    def close(self) -> None:
+        """Write the tables to the archive, replacing any older archive."""
+        if self.closed:
+            return
+        self.closed = True
+        arrays = {table + "." + name: np.asarray(column)
+                  for table, table_columns in self.columns.items()
+                  for name, column in table_columns}
+        temporary_file = self.file_path + ".tmp"
+        with open(temporary_file, "wb") as file:
+            np.savez(file, **arrays)
+        # Replace the old archive only once the new one is complete
+        os.replace(temporary_file, self.file_path)
+
+
+def load_results(file_path: str) -> Dict[str, Dict[str, "np.ndarray"]]:
+    """
+    Read the tables of an archive written by `ResultColumns`.
+
+    Args:
+        file_path (str): Path of the `.npz` archive.
+
+    Returns:
+        Dict[str, Dict[str, np.ndarray]]: The columns of each table, by \
+        name, in order.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    if np is None:
+        raise ImportError("the columnar results need NumPy")
+    tables: Dict[str, Dict[str, "np.ndarray"]] = dict()
+    with np.load(file_path) as archive:
+        for key in archive.files:
+            table, name = key.split(".", 1)
+            tables.setdefault(table, dict())[name] = archive[key]
+    return tables
@@ -0,0 +1,196 @@
+"""
+Online statistics of the job response times and task queueing delays.
+
+Analysing a run from `logs/JRT.txt` means writing every job to the file and \
+reading it back. `ResultStatistics` instead updates the statistics of each \
+metric as the jobs and tasks complete, separately for the short and the \
+long jobs, in memory that does not grow with the length of the trace:
+
+- `RunningMoments` keeps the count, mean, variance (Welford's method), \
+minimum and maximum.
+- `QuantileSketch` keeps a count per logarithmic bucket of the values, the \
+buckets growing by a factor of `gamma`. Any quantile is then estimated \
+within `SKETCH_RELATIVE_ACCURACY` of the exact value, and the number of \
+buckets only grows with the logarithm of the range of the values.
+
+The summary is printed at the end of the run.
+"""
+
+from math import ceil, log, sqrt
+from typing import Dict, Optional, Sequence, Tuple
+from typing_extensions import Final
+
+# Relative error of the quantiles estimated by the QuantileSketch
+SKETCH_RELATIVE_ACCURACY: Final[float] = 0.01
+# Values closer to 0 than this are counted as 0 by the QuantileSketch
+SKETCH_MIN_VALUE: Final[float] = 1e-9
+# Quantiles printed in the summary
+SUMMARY_QUANTILES: Final[Tuple[float, ...]] = (0.5, 0.9, 0.99, 0.999)
+
+
+class RunningMoments(object):
+    """
+    Count, mean, variance and range of a stream of values.
+
+    Args:
+        object (object): This is the parent object class
+    """
+
+    def __init__(self):
+        """Initialise the moments of an empty stream."""
+        self.count = 0
+        self.mean = 0.
+        self.squared_deviations = 0.  # sum of the squared deviations
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+
+    def add(self, value: float) -> None:
+        """Add a value to the stream."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.squared_deviations += delta * (value - self.mean)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    @property
+    def std(self) -> float:
+        """Return the standard deviation of the values."""
+        if self.count < 2:
+            return 0.
+        return sqrt(self.squared_deviations / (self.count - 1))
+
+
+class QuantileSketch(object):
+    """
+    Quantile sketch with a bounded relative error.
+
+    A value `x` > 0 is counted in the bucket `ceil(log(x, gamma))`, which \
+    holds the values in `(gamma**(k-1), gamma**k]`, and negative values are \
+    counted in buckets of their own in the same way.
+
+    Args:
+        object (object): This is the parent object class
+    """
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY):
+        """
+        Initialise an empty sketch.
+
+        Args:
+            relative_accuracy (float, optional): Relative error of the \
+            quantiles. Defaults to SKETCH_RELATIVE_ACCURACY.
+        """
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = log(self.gamma)
+        self.positive: Dict[int, int] = dict()
+        self.negative: Dict[int, int] = dict()
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Add a value to the sketch."""
+        self.count += 1
+        if value > SKETCH_MIN_VALUE:
+            bucket = ceil(log(value) / self.log_gamma)
+            self.positive[bucket] = self.positive.get(bucket, 0) + 1
+        elif value < -SKETCH_MIN_VALUE:
+            bucket = ceil(log(-value) / self.log_gamma)
+            self.negative[bucket] = self.negative.get(bucket, 0) + 1
+        else:
+            self.zero_count += 1
+
+    def _bucket_value(self, bucket: int) -> float:
+        # Value within the relative accuracy of every value of the bucket
+        return 2 * self.gamma ** bucket / (self.gamma + 1)
+
+    def quantile(self, quantile: float) -> Optional[float]:
+        """
+        Estimate a quantile of the values.
+
+        Args:
+            quantile (float): The quantile, between 0 and 1.
+
+        Returns:
+            Optional[float]: The estimate, or None if the sketch is empty.
+        """
+        if not self.count:
+            return None
+        rank = min(max(quantile, 0.), 1.) * (self.count - 1)
+        seen = 0
+        for bucket in sorted(self.negative, reverse=True):
+            seen += self.negative[bucket]
+            if seen > rank:
+                return -self._bucket_value(bucket)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.
+        for bucket in sorted(self.positive):
+            seen += self.positive[bucket]
+            if seen > rank:
+                return self._bucket_value(bucket)
+
+
+class ResultStatistics(object):
+    """
+    Online statistics of the metrics of the short and the long jobs.
+
+    Args:
+        object (object): This is the parent object class
+    """
+
+    def __init__(self, quantiles: Sequence[float] = SUMMARY_QUANTILES):
+        """
+        Initialise the instance of the `ResultStatistics` class.
+
+        Args:
+            quantiles (Sequence[float], optional): Quantiles printed in the \
+            summary. Defaults to SUMMARY_QUANTILES.
+        """
+        self.quantiles = quantiles
+        # (metric, is_short) -> moments and sketch of the values
+        self.metrics: Dict[Tuple[str, bool],
+                           Tuple[RunningMoments, QuantileSketch]] = dict()
+
+    def add(self, metric: str, is_short: bool, value: float) -> None:
+        """
+        Add a value of a metric.
+
+        Args:
+            metric (str): Name of the metric, e.g. "JRT".
+            is_short (bool): Whether the value is that of a short job or of \
+            a task of a short job.
+            value (float): The value.
+        """
+        statistics = self.metrics.get((metric, is_short))
+        if statistics is None:
+            statistics = self.metrics[(metric, is_short)] = (
+                RunningMoments(), QuantileSketch())
+        statistics[0].add(value)
+        statistics[1].add(value)
+
+    def summary(self) -> str:
+        """
+        Return the statistics as comma separated lines with a header.
+
+        The lines are sorted by metric, short jobs first.
+        """
+        lines = ["metric,jobs,count,mean,std,min," +
+                 ",".join(f"p{quantile * 100:g}"
+                          for quantile in self.quantiles) + ",max"]
+        for (metric, is_short), (moments, sketch) in sorted(
+                self.metrics.items(), key=lambda item: (item[0][0],
+                                                        not item[0][1])):
+            fields = [metric, "short" if is_short else "long",
+                      str(moments.count), f"{moments.mean:.6g}",
+                      f"{moments.std:.6g}", f"{moments.minimum:.6g}"]
+            for quantile in self.quantiles:
+                # Clamped to the range of the values, which is exact
+                estimate = min(max(sketch.quantile(quantile),
+                                   moments.minimum), moments.maximum)
+                fields.append(f"{estimate:.6g}")
+            fields.append(f"{moments.maximum:.6g}")
+            lines.append(",".join(fields))
+        return "\n".join(lines)
@@ -31,6 +31,12 @@ class InconsistencyType(Enum):
 
 Master_HEARTBEAT_INTERVAL = 10
 NETWORK_DELAY = 0.0005  # Same as the Sparrow simulator
+# Number of lines of a result file buffered in memory before they are
+# written to it
+RESULTS_BUFFER_RECORDS: Final[int] = 8192
+# Number of signature changes each Master's task queues log for their per
+# worker class heaps before they rebuild them instead
+TASK_QUEUE_LOG_SIZE: Final[int] = 1 << 16
 
 TASK_FILE="task_stats_"+(os.path.basename(sys.argv[1])
                                       .split("_")[-1])+".csv"
@@ -56,3 +62,19 @@ class EstimationErrorDistribution:
     CONSTANT: Final[int] = 0
     RANDOM: Final[int] = 1
     MEAN: Final[int] = 2
+
+
+class EventPriority:
+    """
+    Named constants for ordering events that share a timestamp.
+
+    Events at the same simulation time are run in increasing order of their \
+    priority class, and in the order they were queued within a class. \
+    Workers released at a given instant are therefore seen by the tasks and \
+    job arrivals at that same instant.
+    """
+
+    TASK_END: Final[int] = 0
+    TASK_ARRIVED_AT_WORKER: Final[int] = 1
+    TASK_ARRIVED_AT_MASTER: Final[int] = 2
+    JOB_ARRIVAL: Final[int] = 3
@@ -0,0 +1,6 @@
+from .trace_reader import JobRecord, TraceReader, TextTraceReader
+from .binary_trace import (BinaryTraceReader, MappedTraceReader,
+                           convert_trace, open_trace, write_binary_trace)
+from .prefetch import PrefetchTraceReader
+from .constraint_stream import (ConstraintStream, constraint_cache_file,
+                                constraints_to_mask, mask_to_constraints)
@@ -0,0 +1,253 @@
+"""
+This file contains the binary columnar trace format and its reader.
+
+Reading a text trace means splitting every line and converting every task \
+duration from a string. The binary format stores the same data as typed \
+columns that are loaded straight into arrays, with no parsing:
+
+    header          magic, version, number of jobs, number of tasks
+    start_times     float64[number of jobs]    arrival time of each job
+    est_durations   float64[number of jobs]    estimated duration of each job
+    offsets         int64[number of jobs + 1]  index of the first task of \
+each job in `durations`, followed by the total number of tasks
+    task_counts     int32[number of jobs]      number of tasks of each job
+    durations       int32[number of tasks]     duration of each task
+
+All values are little-endian. The columns holding 8 byte values come first \
+so that every column is aligned to the size of its values.
+"""
+
+from array import array
+import mmap
+import struct
+import sys
+from typing import Iterable, Tuple
+from typing_extensions import Final
+
+from .trace_reader import JobRecord, TextTraceReader, TraceReader
+
+BINARY_TRACE_MAGIC: Final[bytes] = b"SIMTRACE"
+BINARY_TRACE_VERSION: Final[int] = 1
+# magic, version, reserved, number of jobs, number of tasks
+BINARY_TRACE_HEADER: Final[struct.Struct] = struct.Struct("<8sIIQQ")
+
+
+def _byteswap_if_big_endian(column: array) -> None:
+    if sys.byteorder == "big":
+        column.byteswap()
+
+
+def write_binary_trace(records: Iterable[JobRecord],
+                       binary_file: str) -> Tuple[int, int]:
+    """
+    Write job records out in the binary trace format.
+
+    Args:
+        records (Iterable[JobRecord]): The jobs to write, in trace order.
+        binary_file (str): Path to the binary trace file to create.
+
+    Returns:
+        Tuple[int, int]: The number of jobs and of tasks written.
+    """
+    start_times = array("d")
+    estimated_durations = array("d")
+    offsets = array("q", [0])
+    task_counts = array("i")
+    durations = array("i")
+    for record in records:
+        start_times.append(record.start_time)
+        estimated_durations.append(record.estimated_duration)
+        task_counts.append(record.num_tasks)
+        durations.extend(record.durations)
+        offsets.append(len(durations))
+
+    with open(binary_file, "wb") as file:
+        file.write(BINARY_TRACE_HEADER.pack(BINARY_TRACE_MAGIC,
+                                            BINARY_TRACE_VERSION, 0,
+                                            len(start_times), len(durations)))
+        for column in (start_times, estimated_durations, offsets, task_counts,
+                       durations):
+            _byteswap_if_big_endian(column)
+            column.tofile(file)
+    return len(start_times), len(durations)
+
+
+def convert_trace(text_file: str, binary_file: str) -> Tuple[int, int]:
+    """
+    Convert a text trace into the binary trace format.
+
+    Args:
+        text_file (str): Path to the input text trace.
+        binary_file (str): Path to the binary trace file to create.
+
+    Returns:
+        Tuple[int, int]: The number of jobs and of tasks converted.
+    """
+    reader = TextTraceReader(text_file)
+    try:
+        return write_binary_trace(reader, binary_file)
+    finally:
+        reader.close()
+
+
+def is_binary_trace(trace_file: str) -> bool:
+    """Return whether the file starts with the binary trace magic."""
+    with open(trace_file, "rb") as file:
+        return file.read(len(BINARY_TRACE_MAGIC)) == BINARY_TRACE_MAGIC
+
+
+class BinaryTraceReader(TraceReader):
+    """
+    Reader for traces in the binary trace format.
+
+    The columns are read into arrays when the reader is created, and each \
+    `JobRecord` is a view of one row of the job table.
+
+    Args:
+        TraceReader (TraceReader): Parent TraceReader class.
+    """
+
+    def __init__(self, trace_file: str):
+        """
+        Initialise the instance of the `BinaryTraceReader` class.
+
+        Args:
+            trace_file (str): Path to the binary trace file.
+
+        Raises:
+            ValueError: This exception is raised when the file is not a \
+            binary trace of a supported version.
+        """
+        with open(trace_file, "rb") as file:
+            magic, version, _, num_jobs, num_tasks = \
+                BINARY_TRACE_HEADER.unpack(
+                    file.read(BINARY_TRACE_HEADER.size))
+            if magic != BINARY_TRACE_MAGIC:
+                raise ValueError(f"{trace_file} is not a binary trace")
+            if version != BINARY_TRACE_VERSION:
+                raise ValueError(f"{trace_file} has unsupported binary trace "
+                                 f"version {version}")
+            self.start_times = array("d")
+            self.estimated_durations = array("d")
+            self.offsets = array("q")
+            self.task_counts = array("i")
+            self.durations = array("i")
+            for column, length in ((self.start_times, num_jobs),
+                                   (self.estimated_durations, num_jobs),
+                                   (self.offsets, num_jobs + 1),
+                                   (self.task_counts, num_jobs),
+                                   (self.durations, num_tasks)):
+                column.fromfile(file, length)
+                _byteswap_if_big_endian(column)
+        self.num_jobs: int = num_jobs
+        self.next_job = 0
+
+    def __next__(self) -> JobRecord:
+        job_index = self.next_job
+        if job_index == self.num_jobs:
+            raise StopIteration
+        self.next_job = job_index + 1
+        return JobRecord(self.start_times[job_index],
+                         self.task_counts[job_index],
+                         self.estimated_durations[job_index],
+                         self.durations[self.offsets[job_index]:
+                                        self.offsets[job_index + 1]])
+
+
+class MappedTraceReader(TraceReader):
+    """
+    Reader for traces in the binary trace format that maps the file into \
+    memory instead of reading it.
+
+    The columns are typed views over the mapped file, and the task durations \
+    of each `JobRecord` are a view of the mapped `durations` column, so no \
+    trace data is copied onto the Python heap until a job is read. Pages of \
+    the trace that the simulation has not reached yet stay in the page cache.
+
+    The file is mapped as-is, so this reader is only used on little-endian \
+    hosts.
+
+    Args:
+        TraceReader (TraceReader): Parent TraceReader class.
+    """
+
+    def __init__(self, trace_file: str):
+        """
+        Initialise the instance of the `MappedTraceReader` class.
+
+        Args:
+            trace_file (str): Path to the binary trace file.
+
+        Raises:
+            ValueError: This exception is raised when the file is not a \
+            binary trace of a supported version.
+        """
+        with open(trace_file, "rb") as file:
+            self.trace_map = mmap.mmap(file.fileno(), 0,
+                                       access=mmap.ACCESS_READ)
+        magic, version, _, num_jobs, num_tasks = \
+            BINARY_TRACE_HEADER.unpack_from(self.trace_map)
+        if magic != BINARY_TRACE_MAGIC:
+            self.trace_map.close()
+            raise ValueError(f"{trace_file} is not a binary trace")
+        if version != BINARY_TRACE_VERSION:
+            self.trace_map.close()
+            raise ValueError(f"{trace_file} has unsupported binary trace "
+                             f"version {version}")
+        trace_view = memoryview(self.trace_map)
+        columns = []
+        offset = BINARY_TRACE_HEADER.size
+        for typecode, length in (("d", num_jobs), ("d", num_jobs),
+                                 ("q", num_jobs + 1), ("i", num_jobs),
+                                 ("i", num_tasks)):
+            end = offset + length * array(typecode).itemsize
+            columns.append(trace_view[offset:end].cast(typecode))
+            offset = end
+        (self.start_times, self.estimated_durations, self.offsets,
+         self.task_counts, self.durations) = columns
+        trace_view.release()
+        self.num_jobs: int = num_jobs
+        self.next_job = 0
+
+    def __next__(self) -> JobRecord:
+        job_index = self.next_job
+        if job_index == self.num_jobs:
+            raise StopIteration
+        self.next_job = job_index + 1
+        return JobRecord(self.start_times[job_index],
+                         self.task_counts[job_index],
+                         self.estimated_durations[job_index],
+                         self.durations[self.offsets[job_index]:
+                                        self.offsets[job_index + 1]])
+
+    def close(self) -> None:
+        """
+        Release the column views and unmap the trace file.
+
+        The mapping stays open if a `JobRecord` still holds a view of its \
+        durations, and is then unmapped once that view is released.
+        """
+        for column in (self.start_times, self.estimated_durations,
+                       self.offsets, self.task_counts, self.durations):
+            column.release()
+        try:
+            self.trace_map.close()
+        except BufferError:
+            pass
+
+
+def open_trace(trace_file: str) -> TraceReader:
+    """
+    Return a reader for the trace, whichever format it is in.
+
+    Args:
+        trace_file (str): Path to a text or binary trace file.
+
+    Returns:
+        TraceReader: Reader over the jobs of the trace.
+    """
+    if is_binary_trace(trace_file):
+        if sys.byteorder == "little":
+            return MappedTraceReader(trace_file)
+        return BinaryTraceReader(trace_file)
+    return TextTraceReader(trace_file)
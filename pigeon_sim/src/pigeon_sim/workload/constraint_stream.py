@@ -0,0 +1,247 @@
+"""
+This file contains the generator of the task placement constraints.
+
+Every task draws its constraints from `Task.rand_obj` (seeded with 42) in the \
+same way: a task type chosen uniformly, a statistical cluster chosen with the \
+weights of that type, and then one draw per column of the cluster's \
+constraint frequency vector (`tcfv`). Each task therefore uses a fixed number \
+of draws, so the constraints of the n-th task of a run only depend on n and \
+not on the jobs of the trace.
+
+`ConstraintStream` produces the same constraints as `Task.draw_constraints`, \
+packed as one bitmask per task, in which bit j is set when the task requires \
+constraint j. When NumPy is installed, the draws for a whole job are made in \
+one vectorized pass from a NumPy `RandomState` that continues the state of \
+the Python generator: both use the MT19937 generator and build a double from \
+two 32 bit outputs in the same way. The masks can be cached in a file next to \
+the trace so that later runs read them instead of drawing them.
+
+Cache file layout (little-endian):
+
+    header      magic, version, SHA-1 of the generator parameters, \
+number of masks, index of the generator's next output
+    state       uint32[624]         generator state after the last mask
+    masks       uint32[number of masks]
+"""
+
+from array import array
+from bisect import bisect
+from hashlib import sha1
+from itertools import accumulate
+from math import floor
+import os
+import random
+import struct
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence
+from typing_extensions import Final
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the draws are then made one by one
+    np = None
+
+CONSTRAINT_CACHE_MAGIC: Final[bytes] = b"SIMCONST"
+CONSTRAINT_CACHE_VERSION: Final[int] = 1
+# magic, version, parameter digest, number of masks, generator position
+CONSTRAINT_CACHE_HEADER: Final[struct.Struct] = struct.Struct("<8sI20sQI")
+# Number of 32 bit words in the state of the MT19937 generator
+MT_STATE_SIZE: Final[int] = 624
+
+
+def _byteswap_if_big_endian(column: array) -> None:
+    if sys.byteorder == "big":
+        column.byteswap()
+
+
+def mask_to_constraints(mask: int) -> List[int]:
+    """Return the constraints set in a constraint bitmask, in order."""
+    constraints = []
+    constraint = 0
+    while mask:
+        if mask & 1:
+            constraints.append(constraint)
+        mask >>= 1
+        constraint += 1
+    return constraints
+
+
+def constraints_to_mask(constraints: Iterable[int]) -> int:
+    """Return the constraint bitmask with the given constraints set."""
+    mask = 0
+    for constraint in constraints:
+        mask |= 1 << constraint
+    return mask
+
+
+def constraint_cache_file(trace_file: str) -> str:
+    """Return the path of the constraint cache kept next to a trace."""
+    return trace_file + ".constraints"
+
+
+class ConstraintStream(object):
+    """
+    Generator of the packed placement constraints of the tasks of a run.
+
+    Masks are handed out in the order tasks are created. Masks read from the \
+    cache are used first, and any further masks are drawn from the \
+    generator state saved with them.
+    """
+
+    def __init__(self, task_occurrence_type: Dict[str, List[float]],
+                 tcfv: Dict[str, List[float]], seed: int = 42,
+                 cache_file: Optional[str] = None):
+        """
+        Initialise the instance of the `ConstraintStream` class.
+
+        Args:
+            task_occurrence_type (Dict[str, List[float]]): Weights of the \
+            statistical clusters for each task type.
+            tcfv (Dict[str, List[float]]): Frequency, in percent, of each \
+            constraint in each statistical cluster.
+            seed (int, optional): Seed of the generator, the same as that of \
+            `Task.rand_obj`. Defaults to 42.
+            cache_file (Optional[str], optional): File to read cached masks \
+            from and to save them to. Defaults to None, for no caching.
+        """
+        self.task_types = sorted(task_occurrence_type, key=int)
+        self.clusters = sorted(tcfv, key=int)
+        self.cum_weights = [list(accumulate(task_occurrence_type[task_type]))
+                            for task_type in self.task_types]
+        self.frequencies = [tcfv[cluster] for cluster in self.clusters]
+        self.cache_file = cache_file
+        self.digest = sha1(repr((seed, task_occurrence_type, tcfv))
+                           .encode()).digest()
+
+        self.rand_obj = random.Random(seed)
+        self.masks = array("I")  # Every mask handed out or read from cache
+        self.num_cached = 0
+        self.next_mask = 0
+        if cache_file is not None and os.path.exists(cache_file):
+            self._read_cache()
+
+        # The vectorized draws need every task to make the same number of
+        # draws, i.e. every cluster to have as many constraint columns
+        self.random_state = None
+        if np is not None and len(set(map(len, self.frequencies))) == 1:
+            self.random_state = np.random.RandomState()
+            self._set_numpy_state(self.rand_obj.getstate())
+            self.np_cum_weights = np.array(self.cum_weights)
+            self.np_frequencies = np.array(self.frequencies)
+            self.bit_values = np.left_shift(
+                1, np.arange(len(self.frequencies[0]), dtype=np.int64))
+
+    def _set_numpy_state(self, state) -> None:
+        _, internal_state, _ = state
+        self.random_state.set_state(
+            ("MT19937", np.array(internal_state[:MT_STATE_SIZE],
+                                 dtype=np.uint32),
+             internal_state[MT_STATE_SIZE]))
+
+    def _generator_state(self):
+        # State of whichever generator is making the draws
+        if self.random_state is None:
+            return self.rand_obj.getstate()
+        _, key, position, _, _ = self.random_state.get_state()
+        return (3, tuple(int(word) for word in key) + (position,), None)
+
+    def _read_cache(self) -> None:
+        with open(self.cache_file, "rb") as file:
+            header = file.read(CONSTRAINT_CACHE_HEADER.size)
+            if len(header) != CONSTRAINT_CACHE_HEADER.size:
+                return
+            magic, version, digest, num_masks, position = \
+                CONSTRAINT_CACHE_HEADER.unpack(header)
+            if (magic != CONSTRAINT_CACHE_MAGIC
+                    or version != CONSTRAINT_CACHE_VERSION
+                    or digest != self.digest):
+                # Written for other generator parameters, it is overwritten
+                return
+            state = array("I")
+            try:
+                state.fromfile(file, MT_STATE_SIZE)
+                self.masks.fromfile(file, num_masks)
+            except EOFError:  # Truncated, it is overwritten
+                del self.masks[:]
+                return
+        _byteswap_if_big_endian(state)
+        _byteswap_if_big_endian(self.masks)
+        self.num_cached = num_masks
+        self.rand_obj.setstate((3, tuple(state) + (position,), None))
+
+    def _draw_python(self, num_tasks: int) -> None:
+        random_draw = self.rand_obj.random
+        num_types = float(len(self.task_types))
+        for _ in range(num_tasks):
+            # Same draws as random.choices with and without weights
+            cum_weights = self.cum_weights[floor(random_draw() * num_types)]
+            cluster = bisect(cum_weights, random_draw() * cum_weights[-1], 0,
+                             len(cum_weights) - 1)
+            mask = 0
+            for constraint, frequency in enumerate(self.frequencies[cluster]):
+                if random_draw() * 100 <= frequency:
+                    mask |= 1 << constraint
+            self.masks.append(mask)
+
+    def _draw_numpy(self, num_tasks: int) -> None:
+        num_constraints = len(self.bit_values)
+        draws = self.random_state.random_sample(
+            (num_tasks, 2 + num_constraints))
+        task_types = np.floor(draws[:, 0] * len(self.task_types)).astype(
+            np.intp)
+        cum_weights = self.np_cum_weights[task_types]
+        # bisect(cum_weights, x, 0, hi) counts the weights in [0, hi) <= x
+        thresholds = draws[:, 1] * cum_weights[:, -1]
+        clusters = (cum_weights[:, :-1] <= thresholds[:, None]).sum(axis=1)
+        required = draws[:, 2:] * 100 <= self.np_frequencies[clusters]
+        masks = required.astype(np.int64) @ self.bit_values
+        self.masks.frombytes(masks.astype(np.uint32).tobytes())
+
+    def draw(self, num_tasks: int) -> Sequence[int]:
+        """
+        Return the constraint masks of the next tasks.
+
+        Args:
+            num_tasks (int): Number of tasks to return the masks of.
+
+        Returns:
+            Sequence[int]: One constraint bitmask per task.
+        """
+        if self.cache_file is None:
+            # Nothing is saved, so only the masks of this call are kept
+            del self.masks[:]
+            self.next_mask = 0
+        start = self.next_mask
+        missing = start + num_tasks - len(self.masks)
+        if missing > 0:
+            if self.random_state is None:
+                self._draw_python(missing)
+            else:
+                self._draw_numpy(missing)
+        self.next_mask = start + num_tasks
+        return self.masks[start:self.next_mask]
+
+    def close(self) -> None:
+        """Save the masks to the cache file if any were drawn in this run."""
+        if self.cache_file is None or len(self.masks) == self.num_cached:
+            return
+        _, internal_state, _ = self._generator_state()
+        state = array("I", internal_state[:MT_STATE_SIZE])
+        masks = array("I", self.masks)
+        temporary_file = self.cache_file + ".tmp"
+        try:
+            with open(temporary_file, "wb") as file:
+                file.write(CONSTRAINT_CACHE_HEADER.pack(
+                    CONSTRAINT_CACHE_MAGIC, CONSTRAINT_CACHE_VERSION,
+                    self.digest, len(masks), internal_state[MT_STATE_SIZE]))
+                for column in (state, masks):
+                    _byteswap_if_big_endian(column)
+                    column.tofile(file)
+            # Replace the old cache only once the new one is complete
+            os.replace(temporary_file, self.cache_file)
+        except OSError as error:
+            # The cache only saves time, so a run does not fail without it
+            print(f"Could not save the constraint cache: {error}",
+                  file=sys.stderr)
+            return
+        self.num_cached = len(self.masks)
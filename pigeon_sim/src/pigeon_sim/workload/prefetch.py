@@ -0,0 +1,112 @@
+"""
+This file contains the trace reader that prepares jobs ahead of the simulation.
+
+Reading a job from the trace, dephasing its start time and drawing the \
+placement constraints of its tasks does not depend on the state of the \
+simulation, only on the order of the jobs in the trace. The \
+`PrefetchTraceReader` can do this work on a producer thread and hand the \
+ready records to `JobArrivalEvent` through a bounded queue, so that reading \
+and parsing the trace overlaps with running the events.
+"""
+
+from queue import Full, Queue
+from threading import Event, Thread
+from typing import Callable, Optional, Union
+from typing_extensions import Final
+
+from .trace_reader import JobRecord, TraceReader
+
+# Seconds the producer waits on a full queue before checking for `close`
+PUT_TIMEOUT: Final[float] = 0.1
+
+_END_OF_TRACE = object()
+
+
+class PrefetchTraceReader(TraceReader):
+    """
+    Reader that passes every record of another reader through `prepare`.
+
+    With a `depth` of 0 the records are prepared on the caller's thread as \
+    they are read. Otherwise a producer thread reads and prepares up to \
+    `depth` records ahead of the caller. Records are returned in trace order \
+    either way, and since `prepare` is only ever called from one thread, in \
+    trace order, it may keep state of its own (such as a random number \
+    generator) and produce the same records in both modes.
+
+    Args:
+        TraceReader (TraceReader): Parent TraceReader class.
+    """
+
+    def __init__(self, trace_reader: TraceReader,
+                 prepare: Callable[[JobRecord], JobRecord], depth: int = 0):
+        """
+        Initialise the instance of the `PrefetchTraceReader` class.
+
+        Args:
+            trace_reader (TraceReader): Reader over the jobs of the trace.
+            prepare (Callable[[JobRecord], JobRecord]): Function applied to \
+            every record before it is returned.
+            depth (int, optional): Maximum number of prepared records held \
+            ahead of the caller. Defaults to 0, which prepares the records \
+            inline without a producer thread.
+        """
+        self.trace_reader = trace_reader
+        self.prepare = prepare
+        self.depth = depth
+        self.exhausted = False
+        self.producer: Optional[Thread] = None
+        if depth > 0:
+            self.records: "Queue[Union[JobRecord, BaseException, object]]" = \
+                Queue(maxsize=depth)
+            self.stopping = Event()
+            self.producer = Thread(target=self._produce,
+                                   name="trace-prefetch", daemon=True)
+            self.producer.start()
+
+    def _put(self, item) -> bool:
+        # Block on a full queue, but give up once the reader is closed
+        while not self.stopping.is_set():
+            try:
+                self.records.put(item, timeout=PUT_TIMEOUT)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _produce(self) -> None:
+        try:
+            for record in self.trace_reader:
+                if not self._put(self.prepare(record)):
+                    return
+        except BaseException as error:
+            # Re-raised on the simulation's thread by __next__
+            self._put(error)
+            return
+        self._put(_END_OF_TRACE)
+
+    def __next__(self) -> JobRecord:
+        if self.exhausted:
+            raise StopIteration
+        if self.producer is None:
+            try:
+                return self.prepare(next(self.trace_reader))
+            except StopIteration:
+                self.exhausted = True
+                raise
+        item = self.records.get()
+        if item is _END_OF_TRACE:
+            self.exhausted = True
+            raise StopIteration
+        if isinstance(item, BaseException):
+            self.exhausted = True
+            raise item
+        return item
+
+    def close(self) -> None:
+        """Stop the producer thread and close the underlying reader."""
+        if self.producer is not None:
+            self.stopping.set()
+            self.producer.join()
+            self.producer = None
+        self.exhausted = True
+        self.trace_reader.close()
@@ -24,6 +24,28 @@ from pigeon_sim import (debug_print,DEBUG_MODE)
 if __name__ == "__main__":
     WORKLOAD_FILE: Final[str] = sys.argv[1]
     CONFIG_FILE: Final[str] = sys.argv[2]
+    # Optional, selects the event queue backend: "heap" or "calendar"
+    EVENT_QUEUE_BACKEND: Final[str] = (sys.argv[3] if len(sys.argv) > 3
+                                       else "heap")
+    # Optional, number of jobs to read and prepare ahead of the simulation on
+    # a separate thread. 0 (default) prepares each job inline
+    PREFETCH_JOBS: Final[int] = (int(sys.argv[4]) if len(sys.argv) > 4
+                                 else 0)
+    # Optional, number of chunks of result lines queued for a writer thread
+    # that formats and writes them. 0 (default) writes them inline
+    RESULTS_QUEUE_DEPTH: Final[int] = (int(sys.argv[5]) if len(sys.argv) > 5
+                                       else 0)
+    # Optional, "text" (default) or "npz" to write the completed tasks and
+    # jobs as columns to logs/results.npz (needs NumPy), or "none"
+    RESULTS_FORMAT: Final[str] = (sys.argv[6] if len(sys.argv) > 6
+                                  else "text")
+    # Optional, 1 to print JRT and queueing delay statistics at the end of
+    # the run. 0 (default) does not keep them
+    STATISTICS: Final[bool] = (len(sys.argv) > 7 and bool(int(sys.argv[7])))
+    # Optional, "choices" (default) or "alias" to pick the Master of each task
+    # from a per constraint signature alias table of the Masters' weights
+    MASTER_SELECTION: Final[str] = (sys.argv[8] if len(sys.argv) > 8
+                                    else "choices")
     WORKLOAD_FILE_NAME: Final[str] = "subtrace_"+(os.path.basename(WORKLOAD_FILE)
                                       .split("_")[-1])
 
@@ -40,7 +62,9 @@ if __name__ == "__main__":
     # This is not the simulation's virtual time. This is just to
     # understand how long the program takes
     t1 = time.time()
-    s = Simulation(WORKLOAD_FILE, CONFIG_FILE)
+    s = Simulation(WORKLOAD_FILE, CONFIG_FILE, EVENT_QUEUE_BACKEND,
+                   PREFETCH_JOBS, RESULTS_QUEUE_DEPTH, RESULTS_FORMAT,
+                   STATISTICS, MASTER_SELECTION)
     
     print("Simulator Info , Simulation running")
     # logger.metadata("Simulator Info , Simulation running")